@@ -10,6 +10,9 @@ from models.location import Location
 
 logger = logging.getLogger(__name__)
 
+# Sentinel distinguishing "key absent" from a stored None in update_state
+_MISSING = object()
+
 
 class BaseAgent(ABC):
     """
@@ -17,7 +20,13 @@ class BaseAgent(ABC):
     Provides common functionality for message handling, location management,
     and simulation step execution.
     """
-    
+
+    # Fixed attribute set: avoids a per-instance __dict__ and speeds up
+    # attribute access in the per-step hot loops
+    __slots__ = ('agent_id', 'location', 'message_bus', 'state', 'last_step_time',
+                 'active', 'performance_tracker', '_pending_outbox',
+                 '_batch_outbound', '_static_info')
+
     def __init__(self, agent_id: str, location: Location, message_bus):
         """
         Initialize base agent with common properties.
@@ -31,12 +40,29 @@ class BaseAgent(ABC):
         self.location = location
         self.message_bus = message_bus
         self.state: Dict[str, Any] = {}
-        self.last_step_time = 0
+        # Wall time of the current step; step() refreshes it once and all
+        # messages and orders created within the step reuse it
+        self.last_step_time = time.time()
         self.active = True
+        self.performance_tracker = None  # Attached by the web layer when present
+
+        # Outbound message batching (opt-in): agents that set
+        # _batch_outbound to True must call flush_outbox() each step
+        self._pending_outbox: list = []
+        self._batch_outbound = False
+
+        # Static agent info never changes after construction; precompute it
+        # once so get_agent_info only fills in the dynamic fields
+        self._static_info = {
+            'agent_id': self.agent_id,
+            'agent_type': self.__class__.__name__.lower().replace('agent', ''),
+            'location': self.location.name,
+            'location_id': self.location.location_id
+        }
         
         # Subscribe to message bus
         self.message_bus.subscribe(self.agent_id, self.handle_message)
-        logger.info(f"Agent {self.agent_id} initialized at location {self.location.name}")
+        logger.info("Agent %s initialized at location %s", self.agent_id, self.location.name)
     
     @abstractmethod
     def step(self):
@@ -65,42 +91,91 @@ class BaseAgent(ABC):
             message_type: Type of message being sent
             data: Message payload data
         """
+        # Fast path: synchronous local delivery when the bus runs in direct
+        # mode; avoids the Message queue round-trip and the time.time() call
+        if self.message_bus.try_local_dispatch(self.agent_id, recipient, message_type,
+                                               data, self.last_step_time):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s sent %s to %s", self.agent_id, message_type, recipient)
+            return
+
         message = Message(
             sender=self.agent_id,
             recipient=recipient,
             message_type=message_type,
             data=data,
-            timestamp=time.time()
+            timestamp=self.last_step_time
         )
-        
-        self.message_bus.publish(message)
-        logger.debug(f"{self.agent_id} sent {message_type} to {recipient}")
+
+        if self._batch_outbound:
+            self._pending_outbox.append(message)
+        else:
+            self.message_bus.publish(message)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s sent %s to %s", self.agent_id, message_type, recipient)
+
+    def flush_outbox(self):
+        """
+        Publish all batched outbound messages in a single bus call.
+        Agents using outbound batching call this at the end of each step.
+        """
+        if self._pending_outbox:
+            self.message_bus.publish_many(self._pending_outbox)
+            self._pending_outbox.clear()
     
     def process_messages(self):
         """
         Process all queued messages for this agent.
         Called during each simulation step.
         """
-        messages = self.message_bus.deliver_messages(self.agent_id)
-        for message in messages:
+        handler = self.handle_message  # Bind once; avoids per-message attribute lookup
+        for message in self.message_bus.deliver_messages(self.agent_id):
             try:
-                self.handle_message(message)
+                handler(message)
             except Exception as e:
-                logger.error(f"Error processing message in {self.agent_id}: {e}")
+                logger.error("Error processing message in %s: %s", self.agent_id, e)
                 # Continue processing other messages despite errors
     
     def update_state(self, key: str, value: Any):
         """
-        Update agent state with validation.
-        
+        Update agent state with validation. Writes are skipped when the
+        value is unchanged, which keeps repeated per-step updates cheap;
+        observers poll state rather than subscribing to individual writes.
+
         Args:
             key: State key to update
             value: New value for the state key
         """
-        old_value = self.state.get(key)
+        old_value = self.state.get(key, _MISSING)
+        if old_value == value and old_value is not _MISSING:
+            return
         self.state[key] = value
-        logger.debug(f"{self.agent_id} state updated: {key} = {value} (was {old_value})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s state updated: %s = %s (was %s)", self.agent_id, key, value,
+                         None if old_value is _MISSING else old_value)
     
+    def update_state_bulk(self, updates: Dict[str, Any]):
+        """
+        Apply several state updates in one call. Semantics match
+        update_state: unchanged values are skipped. Agents writing their
+        whole monitoring snapshot each step should prefer this over
+        repeated update_state calls.
+
+        Args:
+            updates: Mapping of state keys to new values
+        """
+        state = self.state
+        get = state.get
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for key, value in updates.items():
+            old_value = get(key, _MISSING)
+            if old_value == value and old_value is not _MISSING:
+                continue
+            state[key] = value
+            if debug_enabled:
+                logger.debug("%s state updated: %s = %s (was %s)", self.agent_id, key, value,
+                             None if old_value is _MISSING else old_value)
+
     def get_state(self, key: str, default: Any = None) -> Any:
         """
         Get agent state value.
@@ -120,7 +195,7 @@ class BaseAgent(ABC):
         """
         self.active = False
         self.message_bus.unsubscribe(self.agent_id)
-        logger.info(f"Agent {self.agent_id} deactivated")
+        logger.info("Agent %s deactivated", self.agent_id)
     
     def is_active(self) -> bool:
         """
@@ -143,18 +218,16 @@ class BaseAgent(ABC):
     def get_agent_info(self) -> Dict[str, Any]:
         """
         Get basic information about this agent.
-        
+
         Returns:
-            Dictionary with agent information
+            Dictionary with agent information. The 'state' entry is the live
+            state dict, not a copy; callers must treat it as read-only.
         """
         return {
-            'agent_id': self.agent_id,
-            'agent_type': self.__class__.__name__.lower().replace('agent', ''),
-            'location': self.location.name,
-            'location_id': self.location.location_id,
+            **self._static_info,
             'active': self.active,
             'is_active': self.active,  # For compatibility
-            'state': self.state.copy(),
+            'state': self.state,
             'last_step_time': self.last_step_time
         }
     
@@ -3,7 +3,8 @@ Factory Agent implementation for the supply chain simulator.
 """
 import time
 import logging
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
 from agents.base_agent import BaseAgent
 from models.message import Message
 from models.order import Order
@@ -23,7 +24,12 @@ class FactoryAgent(BaseAgent):
     - Notify warehouses when production is complete and update inventory
     - Queue additional orders when production capacity is reached
     """
-    
+
+    __slots__ = ('production_capacity', 'production_time', 'finished_goods_inventory',
+                 '_inventory_dirty', '_inventory_total', 'production_queue', 'active_production',
+                 '_completion_buckets', 'current_time_step', 'orders_received',
+                 'orders_completed', 'total_production_time', '_message_handlers')
+
     def __init__(self, agent_id: str, location: Location, message_bus,
                  production_capacity: int = 2,
                  production_time: int = 3,
@@ -42,30 +48,41 @@ class FactoryAgent(BaseAgent):
         super().__init__(agent_id, location, message_bus)
         
         # Factory-specific configuration
-        self.production_capacity = production_capacity
-        self.production_time = production_time
-        
+        self.production_capacity: int = production_capacity
+        self.production_time: int = production_time
+
         # Inventory management
-        self.finished_goods_inventory = initial_inventory or {}
-        
+        self.finished_goods_inventory: Dict[str, int] = initial_inventory or {}
+        self._inventory_dirty: bool = True  # Snapshot inventory into state only after changes
+        self._inventory_total: int = sum(self.finished_goods_inventory.values())
+
         # Production queue and scheduling
-        self.production_queue = []  # List of Order objects waiting for production
-        self.active_production = {}  # {order_id: {'order': Order, 'completion_time': int}}
-        self.current_time_step = 0
-        
+        self.production_queue: Deque[Order] = deque()  # FIFO of Order objects waiting for production
+        self.active_production: Dict[str, Tuple[Order, int, int]] = {}  # {order_id: (order, start_time, completion_time)}
+        self._completion_buckets: Dict[int, List[str]] = {}  # Calendar queue: {completion tick: [order_id, ...]}
+        self.current_time_step: int = 0
+
         # Performance tracking
-        self.orders_received = 0
-        self.orders_completed = 0
-        self.total_production_time = 0
+        self.orders_received: int = 0
+        self.orders_completed: int = 0
+        self.total_production_time: int = 0
+
+        # Batch PRODUCTION_COMPLETE notifications into one bus call per step
+        self._batch_outbound = True
+
+        # O(1) message dispatch by type (bound methods, no per-message getattr)
+        self._message_handlers = {
+            "FACTORY_ORDER": self._handle_factory_order
+        }
         
         # Initialize state
         self._update_state()
         
-        logger.info(f"Factory {self.agent_id} initialized with capacity: {self.production_capacity}, "
-                   f"production time: {self.production_time} steps")
-        logger.info(f"Factory {self.agent_id} initial inventory: {self.finished_goods_inventory}")
+        logger.info("Factory %s initialized with capacity: %s, production time: %s steps",
+                   self.agent_id, self.production_capacity, self.production_time)
+        logger.info("Factory %s initial inventory: %s", self.agent_id, self.finished_goods_inventory)
     
-    def step(self):
+    def step(self) -> None:
         """Execute one simulation step for the factory."""
         self.last_step_time = time.time()
         self.current_time_step += 1
@@ -78,26 +95,39 @@ class FactoryAgent(BaseAgent):
         
         # Start new production if capacity allows
         self._start_new_production()
-        
-        # Update state for monitoring
+
+        # Flush batched notifications as a single bus call
+        self.flush_outbox()
+
+    def get_agent_info(self) -> Dict[str, Any]:
+        """
+        Get basic information about this agent, refreshing monitoring state
+        on demand. State is computed when polled rather than every step, so
+        fast-running simulations don't pay for snapshots nobody reads.
+
+        Returns:
+            Dictionary with agent information
+        """
         self._update_state()
-    
-    def handle_message(self, message: Message):
+        return super().get_agent_info()
+
+    def handle_message(self, message: Message) -> None:
         """
         Handle incoming messages.
         
         Args:
             message: Message to process
         """
+        handler = self._message_handlers.get(message.message_type)
+        if handler is None:
+            logger.warning("Factory %s received unknown message type: %s", self.agent_id, message.message_type)
+            return
         try:
-            if message.message_type == "FACTORY_ORDER":
-                self._handle_factory_order(message)
-            else:
-                logger.warning(f"Factory {self.agent_id} received unknown message type: {message.message_type}")
+            handler(message)
         except Exception as e:
-            logger.error(f"Error handling message in Factory {self.agent_id}: {e}")
+            logger.error("Error handling message in Factory %s: %s", self.agent_id, e)
     
-    def _handle_factory_order(self, message: Message):
+    def _handle_factory_order(self, message: Message) -> None:
         """
         Handle production order from warehouse.
         
@@ -105,104 +135,126 @@ class FactoryAgent(BaseAgent):
             message: Factory order message from warehouse
         """
         data = message.data
+
+        # Reject empty orders before doing any other work
+        quantity = data.get('quantity', 0)
+        if quantity <= 0:
+            logger.error("Factory %s received order with non-positive quantity: %s", self.agent_id, data)
+            return
+
         order_id = data.get('order_id')
         product_id = data.get('product_id')
-        quantity = data.get('quantity', 0)
         requester = data.get('requester')
-        
-        # Validate order data
-        if not all([order_id, product_id, quantity > 0, requester]):
-            logger.error(f"Factory {self.agent_id} received invalid order data: {data}")
+
+        # Validate order data (short-circuit, no intermediate list)
+        if not (order_id and product_id and requester):
+            logger.error("Factory %s received invalid order data: %s", self.agent_id, data)
             return
-        
+
         # Create order object
         order = Order(order_id, product_id, quantity, requester)
-        
+
         # Check if we have finished goods in inventory to fulfill immediately
         available_inventory = self.finished_goods_inventory.get(product_id, 0)
-        
+
         if available_inventory >= quantity:
             # Fulfill from inventory immediately
-            self._fulfill_from_inventory(order)
+            self._fulfill_from_inventory(order, available_inventory)
         else:
-            # Add to production queue
-            self.production_queue.append(order)
+            # Add to production queue; urgent orders jump to the head while
+            # the common case stays an O(1) tail append
+            if data.get('priority', 0) > 0:
+                self.production_queue.appendleft(order)
+            else:
+                self.production_queue.append(order)
             self.orders_received += 1
-            
-            logger.info(f"Factory {self.agent_id} queued order {order_id} for {quantity} units of {product_id}")
-            logger.info(f"Factory {self.agent_id} production queue length: {len(self.production_queue)}")
+
+            logger.info("Factory %s queued order %s for %s units of %s", self.agent_id, order_id, quantity, product_id)
+            logger.info("Factory %s production queue length: %s", self.agent_id, len(self.production_queue))
     
-    def _fulfill_from_inventory(self, order: Order):
+    def _fulfill_from_inventory(self, order: Order, available_inventory: int) -> None:
         """
         Fulfill order immediately from finished goods inventory.
-        
+
         Args:
             order: Order to fulfill
+            available_inventory: Current inventory level, already fetched by the caller
         """
-        # Reduce inventory
-        current_inventory = self.finished_goods_inventory.get(order.product_id, 0)
-        self.finished_goods_inventory[order.product_id] = current_inventory - order.quantity
+        # Reduce inventory (level was looked up by the caller)
+        self.finished_goods_inventory[order.product_id] = available_inventory - order.quantity
+        self._inventory_total -= order.quantity
+        self._inventory_dirty = True
         
         # Notify warehouse immediately
         self._notify_production_complete(order)
         
-        logger.info(f"Factory {self.agent_id} fulfilled order {order.order_id} from inventory")
+        logger.info("Factory %s fulfilled order %s from inventory", self.agent_id, order.order_id)
     
-    def _check_production_completion(self):
+    def _check_production_completion(self) -> None:
         """Check for completed production and notify warehouses."""
-        completed_orders = []
-        
-        for order_id, production_info in self.active_production.items():
-            if self.current_time_step >= production_info['completion_time']:
-                completed_orders.append(order_id)
-        
-        # Process completed orders
-        for order_id in completed_orders:
-            production_info = self.active_production[order_id]
-            order = production_info['order']
-            
+        # Calendar-queue lookup: the bucket for the current tick holds exactly
+        # the orders due now, so idle steps cost a single dict probe
+        due = self._completion_buckets.pop(self.current_time_step, None)
+        if due is None:
+            return
+
+        # Bind hot attributes to locals once; these are hit repeatedly when
+        # several orders complete in the same step
+        active = self.active_production
+        inventory = self.finished_goods_inventory
+        notify = self._notify_production_complete
+
+        for order_id in due:
+            # Lazy deletion: skip entries whose production was already removed
+            production_info = active.get(order_id)
+            if production_info is None:
+                continue
+            order, start_time, completion_time = production_info
+
             # Add to finished goods inventory
-            current_inventory = self.finished_goods_inventory.get(order.product_id, 0)
-            self.finished_goods_inventory[order.product_id] = current_inventory + order.quantity
-            
+            inventory[order.product_id] = inventory.get(order.product_id, 0) + order.quantity
+            self._inventory_total += order.quantity
+            self._inventory_dirty = True
+
             # Notify warehouse of completion
-            self._notify_production_complete(order)
-            
+            notify(order)
+
             # Remove from active production
-            del self.active_production[order_id]
+            del active[order_id]
             
             # Update performance metrics
             self.orders_completed += 1
-            production_duration = production_info['completion_time'] - production_info.get('start_time', 0)
-            self.total_production_time += production_duration
+            self.total_production_time += completion_time - start_time
             
-            logger.info(f"Factory {self.agent_id} completed production of order {order_id}")
+            logger.info("Factory %s completed production of order %s", self.agent_id, order_id)
     
-    def _start_new_production(self):
+    def _start_new_production(self) -> None:
         """Start new production orders if capacity allows."""
+        queue = self.production_queue
+        active = self.active_production
+        buckets = self._completion_buckets
+        now = self.current_time_step
+        completion_time = now + self.production_time
+
         # Check if we have capacity and queued orders
-        available_capacity = self.production_capacity - len(self.active_production)
-        
-        while available_capacity > 0 and self.production_queue:
+        available_capacity = self.production_capacity - len(active)
+
+        while available_capacity > 0 and queue:
             # Get next order from queue
-            order = self.production_queue.pop(0)
-            
+            order = queue.popleft()
+
             # Start production
-            completion_time = self.current_time_step + self.production_time
-            
-            self.active_production[order.order_id] = {
-                'order': order,
-                'start_time': self.current_time_step,
-                'completion_time': completion_time
-            }
-            
+            # Compact record: one tuple instead of a three-key dict per order
+            active[order.order_id] = (order, now, completion_time)
+            buckets.setdefault(completion_time, []).append(order.order_id)
+
             order.update_status('processing')
             available_capacity -= 1
             
-            logger.info(f"Factory {self.agent_id} started production of order {order.order_id}, "
-                       f"completion expected at time step {completion_time}")
+            logger.info("Factory %s started production of order %s, completion expected at time step %s",
+                       self.agent_id, order.order_id, completion_time)
     
-    def _notify_production_complete(self, order: Order):
+    def _notify_production_complete(self, order: Order) -> None:
         """
         Notify warehouse that production is complete.
         
@@ -218,11 +270,15 @@ class FactoryAgent(BaseAgent):
         self.send_message(order.requester, "PRODUCTION_COMPLETE", completion_data)
         order.update_status('delivered')
         
-        logger.info(f"Factory {self.agent_id} notified {order.requester} of completed order {order.order_id}")
+        logger.info("Factory %s notified %s of completed order %s", self.agent_id, order.requester, order.order_id)
     
-    def _update_state(self):
+    def _update_state(self) -> None:
         """Update agent state for monitoring."""
-        self.update_state('finished_goods_inventory', self.finished_goods_inventory.copy())
+        # Only re-snapshot the inventory dict when it actually changed;
+        # the copy is O(products) and most steps leave inventory untouched
+        if self._inventory_dirty:
+            self.update_state('finished_goods_inventory', self.finished_goods_inventory.copy())
+            self._inventory_dirty = False
         self.update_state('production_queue_length', len(self.production_queue))
         self.update_state('active_production_count', len(self.active_production))
         self.update_state('production_capacity', self.production_capacity)
@@ -234,14 +290,23 @@ class FactoryAgent(BaseAgent):
         utilization = len(self.active_production) / max(self.production_capacity, 1)
         self.update_state('capacity_utilization', utilization)
     
-    def get_production_status(self) -> Dict[str, Any]:
+    def get_available_capacity(self) -> int:
         """
-        Get current production status information.
-        
+        Get the number of free production slots.
+
         Returns:
-            Dictionary with production status information
+            Available production capacity
         """
-        queue_orders = [
+        return self.production_capacity - len(self.active_production)
+
+    def get_queue_snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Get a snapshot of the orders waiting in the production queue.
+
+        Returns:
+            List of queued order summaries
+        """
+        return [
             {
                 'order_id': order.order_id,
                 'product_id': order.product_id,
@@ -250,23 +315,40 @@ class FactoryAgent(BaseAgent):
             }
             for order in self.production_queue
         ]
-        
+
+    def get_active_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a snapshot of orders currently in production.
+
+        Returns:
+            Dictionary of active order summaries keyed by order id
+        """
+        now = self.current_time_step
         active_orders = {}
-        for order_id, production_info in self.active_production.items():
-            order = production_info['order']
+        for order_id, (order, _, completion_time) in self.active_production.items():
             active_orders[order_id] = {
                 'product_id': order.product_id,
                 'quantity': order.quantity,
                 'requester': order.requester,
-                'completion_time': production_info['completion_time'],
-                'remaining_time': max(0, production_info['completion_time'] - self.current_time_step)
+                'completion_time': completion_time,
+                'remaining_time': max(0, completion_time - now)
             }
-        
+        return active_orders
+
+    def get_production_status(self) -> Dict[str, Any]:
+        """
+        Get current production status information. Callers interested in a
+        single field should prefer the targeted accessors above, which avoid
+        building the full queue/active snapshots.
+
+        Returns:
+            Dictionary with production status information
+        """
         return {
-            'production_queue': queue_orders,
-            'active_production': active_orders,
+            'production_queue': self.get_queue_snapshot(),
+            'active_production': self.get_active_snapshot(),
             'capacity_utilization': len(self.active_production) / max(self.production_capacity, 1),
-            'available_capacity': self.production_capacity - len(self.active_production)
+            'available_capacity': self.get_available_capacity()
         }
     
     def get_inventory_level(self, product_id: str) -> int:
@@ -281,7 +363,7 @@ class FactoryAgent(BaseAgent):
         """
         return self.finished_goods_inventory.get(product_id, 0)
     
-    def add_product_to_inventory(self, product_id: str, quantity: int):
+    def add_product_to_inventory(self, product_id: str, quantity: int) -> None:
         """
         Add finished goods to inventory (for testing or initial setup).
         
@@ -291,7 +373,9 @@ class FactoryAgent(BaseAgent):
         """
         current_inventory = self.finished_goods_inventory.get(product_id, 0)
         self.finished_goods_inventory[product_id] = current_inventory + quantity
-        logger.info(f"Factory {self.agent_id} added {quantity} units of {product_id} to inventory")
+        self._inventory_total += quantity
+        self._inventory_dirty = True
+        logger.info("Factory %s added %s units of %s to inventory", self.agent_id, quantity, product_id)
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """
@@ -305,8 +389,9 @@ class FactoryAgent(BaseAgent):
             if self.orders_completed > 0 else 0
         )
         
-        total_inventory = sum(self.finished_goods_inventory.values())
-        
+        # Maintained incrementally; avoids an O(products) reduction per poll
+        total_inventory = self._inventory_total
+
         return {
             'orders_received': self.orders_received,
             'orders_completed': self.orders_completed,
@@ -319,8 +404,8 @@ class FactoryAgent(BaseAgent):
             'finished_goods_by_product': self.finished_goods_inventory.copy()
         }
     
-    def set_production_parameters(self, capacity: Optional[int] = None, 
-                                production_time: Optional[int] = None):
+    def set_production_parameters(self, capacity: Optional[int] = None,
+                                production_time: Optional[int] = None) -> None:
         """
         Update production parameters (for testing or configuration changes).
         
@@ -330,8 +415,8 @@ class FactoryAgent(BaseAgent):
         """
         if capacity is not None and capacity > 0:
             self.production_capacity = capacity
-            logger.info(f"Factory {self.agent_id} production capacity updated to {capacity}")
+            logger.info("Factory %s production capacity updated to %s", self.agent_id, capacity)
         
         if production_time is not None and production_time > 0:
             self.production_time = production_time
-            logger.info(f"Factory {self.agent_id} production time updated to {production_time} steps")
\ No newline at end of file
+            logger.info("Factory %s production time updated to %s steps", self.agent_id, production_time)
\ No newline at end of file
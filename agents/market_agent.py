@@ -1,7 +1,9 @@
 """
 Market Agent implementation for the supply chain simulator.
 """
+import sys
 import time
+import heapq
 import random
 import logging
 from typing import Dict, Any, List
@@ -21,7 +23,22 @@ class MarketAgent(BaseAgent):
     - Notify affected store agents when demand changes
     - Create demand spikes or drops when special events occur
     """
-    
+
+    # Per-event-type sampling parameters: (store-count range or None for
+    # all stores, multiplier range or None for signed regional draw,
+    # duration range in time steps)
+    EVENT_SPECS = {
+        'demand_spike': ((1, 3), (1.5, 3.0), (3, 8)),
+        'demand_drop': ((1, 2), (0.2, 0.7), (4, 10)),
+        'regional_event': (None, None, (5, 12)),
+    }
+
+    __slots__ = ('store_ids', '_store_id_set', 'base_demand_rate', 'demand_variation',
+                 'event_probability', 'store_demand_rates', '_modifier_by_store',
+                 '_message_handlers', '_rng', 'active_events', 'event_counter',
+                 '_now', 'demand_update_interval', '_steps_since_update',
+                 '_tick', '_expiry_heap')
+
     def __init__(self, agent_id: str, location: Location, message_bus,
                  store_ids: List[str] = None,
                  base_demand_rate: float = 1.0,
@@ -42,32 +59,65 @@ class MarketAgent(BaseAgent):
         super().__init__(agent_id, location, message_bus)
         
         # Market-specific state
-        self.store_ids = store_ids or []
+        # Intern store ids up front: every demand tick keys dict lookups by
+        # these strings, and interning makes those probes identity-based
+        self.store_ids = [sys.intern(store_id) for store_id in (store_ids or [])]
+        # Set mirror of store_ids for O(1) membership checks; the list is
+        # kept for ordered iteration and sampling
+        self._store_id_set = set(self.store_ids)
         self.base_demand_rate = max(base_demand_rate, 2.0)  # Ensure minimum demand for demo
         self.demand_variation = demand_variation
         self.event_probability = max(event_probability, 0.15)  # Increase event probability for demo
         
         # Track current demand rates for each store
         self.store_demand_rates = {store_id: self.base_demand_rate for store_id in self.store_ids}
+
+        # Combined multiplier of active events per store, maintained
+        # incrementally as events start and end (1.0 when absent)
+        self._modifier_by_store = {}
+
+        # Demand notifications fan out to every managed store; batch them
+        # into a single publish_many call per step
+        self._batch_outbound = True
+
+        # O(1) message dispatch by type (bound methods, no per-message getattr)
+        self._message_handlers = {
+            "REGISTER_STORE": self._handle_store_registration,
+            "UNREGISTER_STORE": self._handle_store_unregistration
+        }
+
+        # Dedicated RNG instance: skips the module-level indirection of the
+        # random functions and isolates this agent's stream from global
+        # random.seed() use elsewhere
+        self._rng = random.Random()
         
         # Event tracking
         self.active_events = {}  # {event_id: event_data}
         self.event_counter = 0
-        self.last_demand_update = 0
+        self._tick = 0  # Logical step counter for event expiry
+        self._expiry_heap = []  # Min-heap of (expiry_tick, event_id)
+        self._now = time.time()  # Shared per-step timestamp; refreshed in step()
         self.demand_update_interval = 3  # Update demand every 3 time steps for more activity
+        self._steps_since_update = 0  # Logical tick counter; avoids wall-clock reads
         
-        # Initialize state
-        self.update_state('store_demand_rates', self.store_demand_rates.copy())
+        # Initialize state. The demand-rates entry is the live dict (not a
+        # copy) so per-tick state refreshes don't re-copy it; monitoring
+        # consumers treat agent state as read-only
+        self.update_state('store_demand_rates', self.store_demand_rates)
         self.update_state('active_events', len(self.active_events))
         self.update_state('base_demand_rate', self.base_demand_rate)
         self.update_state('demand_variation', self.demand_variation)
         self.update_state('event_probability', self.event_probability)
         
-        logger.info(f"Market {self.agent_id} initialized managing {len(self.store_ids)} stores")
+        logger.info("Market %s initialized managing %d stores", self.agent_id, len(self.store_ids))
     
     def step(self):
         """Execute one simulation step for the market agent."""
-        self.last_step_time = time.time()
+        # One wall-clock read per step; every timestamp written during this
+        # tick (messages, event start times) shares it
+        self._now = time.time()
+        self.last_step_time = self._now
+        self._tick += 1
         
         # Process any incoming messages first
         self.process_messages()
@@ -84,6 +134,9 @@ class MarketAgent(BaseAgent):
         
         # Update state for monitoring
         self._update_state()
+
+        # Publish this step's batched demand/event notifications in one call
+        self.flush_outbox()
     
     def handle_message(self, message: Message):
         """
@@ -92,15 +145,14 @@ class MarketAgent(BaseAgent):
         Args:
             message: Message to process
         """
+        handler = self._message_handlers.get(message.message_type)
+        if handler is None:
+            logger.warning("Market %s received unknown message type: %s", self.agent_id, message.message_type)
+            return
         try:
-            if message.message_type == "REGISTER_STORE":
-                self._handle_store_registration(message)
-            elif message.message_type == "UNREGISTER_STORE":
-                self._handle_store_unregistration(message)
-            else:
-                logger.warning(f"Market {self.agent_id} received unknown message type: {message.message_type}")
+            handler(message)
         except Exception as e:
-            logger.error(f"Error handling message in Market {self.agent_id}: {e}")
+            logger.error("Error handling message in Market %s: %s", self.agent_id, e)
     
     def _should_update_demand(self) -> bool:
         """
@@ -109,30 +161,35 @@ class MarketAgent(BaseAgent):
         Returns:
             True if demand should be updated
         """
-        current_time = time.time()
-        return (current_time - self.last_demand_update) >= self.demand_update_interval
+        self._steps_since_update += 1
+        return self._steps_since_update >= self.demand_update_interval
     
     def _update_demand_patterns(self):
         """Update demand patterns for all managed stores."""
-        self.last_demand_update = time.time()
-        
+        self._steps_since_update = 0
+
+        # Hoist per-iteration attribute and function lookups out of the loop;
+        # this runs once per managed store on every demand tick
+        base = self.base_demand_rate
+        variation = self.demand_variation
+        uniform = self._rng.uniform
+        rates = self.store_demand_rates
+        get_modifier = self._get_event_modifier
+        notify = self._notify_store_demand_change
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
         for store_id in self.store_ids:
-            # Generate new demand rate with variation
-            variation = random.uniform(-self.demand_variation, self.demand_variation)
-            new_demand_rate = max(0.1, self.base_demand_rate + variation)  # Minimum 0.1 to avoid zero demand
-            
-            # Apply event modifiers if any active events affect this store
-            event_modifier = self._get_event_modifier(store_id)
-            new_demand_rate *= event_modifier
-            
-            # Update stored demand rate
-            old_demand_rate = self.store_demand_rates.get(store_id, self.base_demand_rate)
-            self.store_demand_rates[store_id] = new_demand_rate
-            
-            # Notify store of demand change
-            self._notify_store_demand_change(store_id, new_demand_rate)
-            
-            logger.debug(f"Market {self.agent_id} updated demand for {store_id}: {old_demand_rate:.2f} -> {new_demand_rate:.2f}")
+            # New rate with variation, floored at 0.1 to avoid zero demand,
+            # scaled by any active event modifiers
+            new_demand_rate = max(0.1, base + uniform(-variation, variation)) * get_modifier(store_id)
+
+            if debug_enabled:
+                old_demand_rate = rates.get(store_id, base)
+                logger.debug("Market %s updated demand for %s: %.2f -> %.2f",
+                             self.agent_id, store_id, old_demand_rate, new_demand_rate)
+
+            rates[store_id] = new_demand_rate
+            notify(store_id, new_demand_rate)
     
     def _notify_store_demand_change(self, store_id: str, new_demand_rate: float):
         """
@@ -144,147 +201,114 @@ class MarketAgent(BaseAgent):
         """
         demand_data = {
             'demand_rate': new_demand_rate,
-            'timestamp': time.time(),
+            'timestamp': self._now,
             'source': 'market_update'
         }
         
         self.send_message(store_id, "DEMAND_UPDATE", demand_data)
-        logger.debug(f"Market {self.agent_id} notified {store_id} of demand change: {new_demand_rate:.2f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Market %s notified %s of demand change: %.2f",
+                         self.agent_id, store_id, new_demand_rate)
     
     def _check_and_trigger_events(self):
         """Check for and trigger special market events."""
-        if random.random() < self.event_probability:
+        if self._rng.random() < self.event_probability:
             self._trigger_random_event()
     
     def _trigger_random_event(self):
         """Trigger a random market event."""
-        event_types = ['demand_spike', 'demand_drop', 'regional_event']
-        event_type = random.choice(event_types)
+        event_type = self._rng.choice(list(self.EVENT_SPECS))
         
         self.event_counter += 1
         event_id = f"event_{self.event_counter}"
         
-        if event_type == 'demand_spike':
-            self._trigger_demand_spike(event_id)
-        elif event_type == 'demand_drop':
-            self._trigger_demand_drop(event_id)
-        elif event_type == 'regional_event':
-            self._trigger_regional_event(event_id)
+        self._trigger_event(event_id, event_type)
     
-    def _trigger_demand_spike(self, event_id: str):
+    def _trigger_event(self, event_id: str, event_type: str):
         """
-        Trigger a demand spike event.
-        
-        Args:
-            event_id: Unique identifier for this event
-        """
-        # Select random stores to affect (1-3 stores)
-        affected_stores = random.sample(self.store_ids, min(random.randint(1, 3), len(self.store_ids)))
-        
-        # Create event data
-        event_data = {
-            'type': 'demand_spike',
-            'affected_stores': affected_stores,
-            'multiplier': random.uniform(1.5, 3.0),  # 1.5x to 3x demand
-            'duration': random.randint(3, 8),  # 3-8 time steps
-            'remaining_duration': random.randint(3, 8),
-            'start_time': time.time()
-        }
-        
-        self.active_events[event_id] = event_data
-        
-        # Immediately notify affected stores
-        for store_id in affected_stores:
-            current_demand = self.store_demand_rates.get(store_id, self.base_demand_rate)
-            spiked_demand = current_demand * event_data['multiplier']
-            self.store_demand_rates[store_id] = spiked_demand
-            self._notify_store_demand_change(store_id, spiked_demand)
-        
-        logger.info(f"Market {self.agent_id} triggered demand spike {event_id} affecting {len(affected_stores)} stores")
-    
-    def _trigger_demand_drop(self, event_id: str):
-        """
-        Trigger a demand drop event.
-        
+        Trigger a market event of the given type using EVENT_SPECS.
+
         Args:
             event_id: Unique identifier for this event
+            event_type: Key into EVENT_SPECS
         """
-        # Select random stores to affect (1-2 stores)
-        affected_stores = random.sample(self.store_ids, min(random.randint(1, 2), len(self.store_ids)))
-        
-        # Create event data
+        store_range, multiplier_range, duration_range = self.EVENT_SPECS[event_type]
+
+        is_positive = None
+        if store_range is None:
+            # Regional events affect every store and can be positive or
+            # negative; the sign picks the multiplier range
+            affected_stores = tuple(self.store_ids)
+            is_positive = self._rng.choice([True, False])
+            multiplier_range = (1.2, 2.0) if is_positive else (0.3, 0.8)
+        else:
+            # Affected stores are stored as an immutable tuple so snapshots
+            # can share them without deep copying
+            count = min(self._rng.randint(*store_range), len(self.store_ids))
+            affected_stores = tuple(self._rng.sample(self.store_ids, count))
+
+        multiplier = self._rng.uniform(*multiplier_range)
+        # Sample once so duration and remaining_duration agree
+        duration = self._rng.randint(*duration_range)
+
         event_data = {
-            'type': 'demand_drop',
+            'type': event_type,
             'affected_stores': affected_stores,
-            'multiplier': random.uniform(0.2, 0.7),  # 20% to 70% of normal demand
-            'duration': random.randint(4, 10),  # 4-10 time steps
-            'remaining_duration': random.randint(4, 10),
-            'start_time': time.time()
+            'multiplier': multiplier,
+            'duration': duration,
+            'remaining_duration': duration,
+            'start_time': self._now
         }
-        
-        self.active_events[event_id] = event_data
-        
+        if is_positive is not None:
+            event_data['is_positive'] = is_positive
+
+        self._register_event(event_id, event_data)
+        self._apply_event_modifier(affected_stores, multiplier)
+
         # Immediately notify affected stores
+        rates = self.store_demand_rates
+        base = self.base_demand_rate
         for store_id in affected_stores:
-            current_demand = self.store_demand_rates.get(store_id, self.base_demand_rate)
-            dropped_demand = current_demand * event_data['multiplier']
-            self.store_demand_rates[store_id] = dropped_demand
-            self._notify_store_demand_change(store_id, dropped_demand)
-        
-        logger.info(f"Market {self.agent_id} triggered demand drop {event_id} affecting {len(affected_stores)} stores")
-    
-    def _trigger_regional_event(self, event_id: str):
+            modified_demand = rates.get(store_id, base) * multiplier
+            rates[store_id] = modified_demand
+            self._notify_store_demand_change(store_id, modified_demand)
+
+        if is_positive is None:
+            logger.info("Market %s triggered %s %s affecting %d stores",
+                        self.agent_id, event_type, event_id, len(affected_stores))
+        else:
+            logger.info("Market %s triggered %s regional event %s affecting all stores",
+                        self.agent_id, "positive" if is_positive else "negative", event_id)
+
+    def _register_event(self, event_id: str, event_data: Dict[str, Any]):
         """
-        Trigger a regional event affecting multiple stores.
-        
+        Record a new event and schedule its expiry.
+
         Args:
-            event_id: Unique identifier for this event
+            event_id: Event identifier
+            event_data: Event data dictionary
         """
-        # Affect most or all stores
-        affected_stores = self.store_ids.copy()
-        
-        # Random event type (positive or negative)
-        is_positive = random.choice([True, False])
-        multiplier = random.uniform(1.2, 2.0) if is_positive else random.uniform(0.3, 0.8)
-        
-        # Create event data
-        event_data = {
-            'type': 'regional_event',
-            'affected_stores': affected_stores,
-            'multiplier': multiplier,
-            'duration': random.randint(5, 12),  # 5-12 time steps
-            'remaining_duration': random.randint(5, 12),
-            'start_time': time.time(),
-            'is_positive': is_positive
-        }
-        
+        event_data['expiry_tick'] = self._tick + event_data['duration']
         self.active_events[event_id] = event_data
-        
-        # Immediately notify affected stores
-        for store_id in affected_stores:
-            current_demand = self.store_demand_rates.get(store_id, self.base_demand_rate)
-            modified_demand = current_demand * event_data['multiplier']
-            self.store_demand_rates[store_id] = modified_demand
-            self._notify_store_demand_change(store_id, modified_demand)
-        
-        event_type = "positive" if is_positive else "negative"
-        logger.info(f"Market {self.agent_id} triggered {event_type} regional event {event_id} affecting all stores")
-    
+        heapq.heappush(self._expiry_heap, (event_data['expiry_tick'], event_id))
+
     def _update_active_events(self):
-        """Update active events and remove expired ones."""
-        expired_events = []
-        
-        for event_id, event_data in self.active_events.items():
-            event_data['remaining_duration'] -= 1
-            
-            if event_data['remaining_duration'] <= 0:
-                expired_events.append(event_id)
-        
-        # Remove expired events and restore normal demand
-        for event_id in expired_events:
-            event_data = self.active_events[event_id]
-            self._end_event(event_id, event_data)
-            del self.active_events[event_id]
+        """Remove events whose expiry tick has been reached."""
+        # Only the heap top is inspected each step, so ticks where nothing
+        # expires (the common case) cost a single comparison
+        heap = self._expiry_heap
+        expired = False
+        while heap and heap[0][0] <= self._tick:
+            _, event_id = heapq.heappop(heap)
+            event_data = self.active_events.pop(event_id, None)
+            if event_data is not None:
+                self._end_event(event_id, event_data)
+                expired = True
+
+        # With no events active every modifier is exactly 1.0; clearing the
+        # cache also resets any accumulated floating-point drift
+        if expired and not self.active_events:
+            self._modifier_by_store.clear()
     
     def _end_event(self, event_id: str, event_data: Dict[str, Any]):
         """
@@ -295,18 +319,48 @@ class MarketAgent(BaseAgent):
             event_data: Event data dictionary
         """
         affected_stores = event_data['affected_stores']
-        
+        self._remove_event_modifier(affected_stores, event_data['multiplier'])
+
         # Restore normal demand rates for affected stores
         for store_id in affected_stores:
             # Calculate normal demand (base + small random variation)
-            variation = random.uniform(-self.demand_variation * 0.5, self.demand_variation * 0.5)
+            variation = self._rng.uniform(-self.demand_variation * 0.5, self.demand_variation * 0.5)
             normal_demand = max(0.1, self.base_demand_rate + variation)
             
             self.store_demand_rates[store_id] = normal_demand
             self._notify_store_demand_change(store_id, normal_demand)
         
-        logger.info(f"Market {self.agent_id} ended event {event_id} ({event_data['type']})")
+        logger.info("Market %s ended event %s (%s)", self.agent_id, event_id, event_data['type'])
     
+    def _apply_event_modifier(self, affected_stores, multiplier: float):
+        """
+        Fold a starting event's multiplier into the per-store cache.
+
+        Args:
+            affected_stores: Stores the event applies to
+            multiplier: Event demand multiplier
+        """
+        modifiers = self._modifier_by_store
+        for store_id in affected_stores:
+            modifiers[store_id] = modifiers.get(store_id, 1.0) * multiplier
+
+    def _remove_event_modifier(self, affected_stores, multiplier: float):
+        """
+        Divide an ended event's multiplier back out of the per-store cache.
+
+        Args:
+            affected_stores: Stores the event applied to
+            multiplier: Event demand multiplier
+        """
+        modifiers = self._modifier_by_store
+        for store_id in affected_stores:
+            remaining = modifiers.get(store_id, 1.0) / multiplier
+            if abs(remaining - 1.0) < 1e-9:
+                # Last event for this store; drop the entry to stop float drift
+                modifiers.pop(store_id, None)
+            else:
+                modifiers[store_id] = remaining
+
     def _get_event_modifier(self, store_id: str) -> float:
         """
         Get the combined event modifier for a store.
@@ -317,13 +371,7 @@ class MarketAgent(BaseAgent):
         Returns:
             Combined multiplier from all active events affecting this store
         """
-        modifier = 1.0
-        
-        for event_data in self.active_events.values():
-            if store_id in event_data['affected_stores']:
-                modifier *= event_data['multiplier']
-        
-        return modifier
+        return self._modifier_by_store.get(store_id, 1.0)
     
     def _handle_store_registration(self, message: Message):
         """
@@ -335,10 +383,13 @@ class MarketAgent(BaseAgent):
         data = message.data
         store_id = data.get('store_id')
         
-        if store_id and store_id not in self.store_ids:
+        if store_id:
+            store_id = sys.intern(store_id)
+        if store_id and store_id not in self._store_id_set:
+            self._store_id_set.add(store_id)
             self.store_ids.append(store_id)
             self.store_demand_rates[store_id] = self.base_demand_rate
-            logger.info(f"Market {self.agent_id} registered store {store_id}")
+            logger.info("Market %s registered store %s", self.agent_id, store_id)
     
     def _handle_store_unregistration(self, message: Message):
         """
@@ -350,14 +401,15 @@ class MarketAgent(BaseAgent):
         data = message.data
         store_id = data.get('store_id')
         
-        if store_id and store_id in self.store_ids:
+        if store_id and store_id in self._store_id_set:
+            self._store_id_set.discard(store_id)
             self.store_ids.remove(store_id)
             self.store_demand_rates.pop(store_id, None)
-            logger.info(f"Market {self.agent_id} unregistered store {store_id}")
+            logger.info("Market %s unregistered store %s", self.agent_id, store_id)
     
     def _update_state(self):
         """Update agent state for monitoring."""
-        self.update_state('store_demand_rates', self.store_demand_rates.copy())
+        self.update_state('store_demand_rates', self.store_demand_rates)
         self.update_state('active_events', len(self.active_events))
         self.update_state('managed_stores', len(self.store_ids))
         self.update_state('base_demand_rate', self.base_demand_rate)
@@ -371,10 +423,12 @@ class MarketAgent(BaseAgent):
         Args:
             store_id: Store agent ID to add
         """
-        if store_id not in self.store_ids:
+        store_id = sys.intern(store_id)
+        if store_id not in self._store_id_set:
+            self._store_id_set.add(store_id)
             self.store_ids.append(store_id)
             self.store_demand_rates[store_id] = self.base_demand_rate
-            logger.info(f"Market {self.agent_id} added store {store_id}")
+            logger.info("Market %s added store %s", self.agent_id, store_id)
     
     def remove_store(self, store_id: str):
         """
@@ -383,10 +437,11 @@ class MarketAgent(BaseAgent):
         Args:
             store_id: Store agent ID to remove
         """
-        if store_id in self.store_ids:
+        if store_id in self._store_id_set:
+            self._store_id_set.discard(store_id)
             self.store_ids.remove(store_id)
             self.store_demand_rates.pop(store_id, None)
-            logger.info(f"Market {self.agent_id} removed store {store_id}")
+            logger.info("Market %s removed store %s", self.agent_id, store_id)
     
     def get_store_demand_rate(self, store_id: str) -> float:
         """
@@ -403,12 +458,20 @@ class MarketAgent(BaseAgent):
     def get_active_events(self) -> Dict[str, Dict[str, Any]]:
         """
         Get information about currently active events.
-        
+
         Returns:
-            Dictionary of active events
+            Dictionary of active event snapshots. The per-event dicts are
+            shallow copies sharing the immutable affected_stores tuples;
+            callers must not mutate them.
         """
-        import copy
-        return copy.deepcopy(self.active_events)
+        snapshots = {}
+        for event_id, event_data in self.active_events.items():
+            snapshot = event_data.copy()
+            # remaining_duration is derived from the expiry tick rather than
+            # decremented in place every step
+            snapshot['remaining_duration'] = max(0, event_data['expiry_tick'] - self._tick)
+            snapshots[event_id] = snapshot
+        return snapshots
     
     def force_event(self, event_type: str, affected_stores: List[str] = None):
         """
@@ -422,23 +485,25 @@ class MarketAgent(BaseAgent):
         event_id = f"forced_event_{self.event_counter}"
         
         if affected_stores is None:
-            affected_stores = random.sample(self.store_ids, min(2, len(self.store_ids)))
-        
-        if event_type == 'demand_spike':
-            self._trigger_demand_spike(event_id)
-        elif event_type == 'demand_drop':
-            self._trigger_demand_drop(event_id)
-        elif event_type == 'regional_event':
-            self._trigger_regional_event(event_id)
-        else:
-            logger.warning(f"Unknown event type: {event_type}")
+            affected_stores = self._rng.sample(self.store_ids, min(2, len(self.store_ids)))
+        
+        if event_type not in self.EVENT_SPECS:
+            logger.warning("Unknown event type: %s", event_type)
+            return
+        self._trigger_event(event_id, event_type)
+
+        # Forced events fire outside the step loop; flush their
+        # notifications immediately rather than waiting for the next step
+        self.flush_outbox()
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """
         Get performance metrics for this market agent.
         
         Returns:
-            Dictionary with performance metrics
+            Dictionary with performance metrics. The demand-rate entry
+            references the live dict; callers must not mutate it. Event
+            details are derived snapshots from get_active_events.
         """
         total_events_triggered = self.event_counter
         active_event_count = len(self.active_events)
@@ -452,6 +517,8 @@ class MarketAgent(BaseAgent):
             'base_demand_rate': self.base_demand_rate,
             'demand_variation': self.demand_variation,
             'event_probability': self.event_probability,
-            'store_demand_rates': self.store_demand_rates.copy(),
-            'active_event_details': self.active_events.copy()
+            'store_demand_rates': self.store_demand_rates,
+            # Snapshots carry the remaining_duration derived from the
+            # expiry heap; the stored dicts keep only the initial duration
+            'active_event_details': self.get_active_events()
         }
\ No newline at end of file
@@ -1,9 +1,10 @@
 """
 Message Bus implementation for agent communication using publish-subscribe pattern.
 """
-from typing import Dict, List, Callable, Any
-from collections import defaultdict
+from typing import Dict, List, Callable, Any, Deque
+from collections import defaultdict, deque
 import logging
+import sys
 from models.message import Message
 
 logger = logging.getLogger(__name__)
@@ -17,9 +18,48 @@ class MessageBus:
     
     def __init__(self):
         self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
-        self._agent_queues: Dict[str, List[Message]] = defaultdict(list)
         self._max_queue_size = 100  # Prevent memory issues
-        
+        # Bounded deques drop the oldest message in O(1) on overflow,
+        # unlike list.pop(0) which shifts the whole queue
+        self._agent_queues: Dict[str, Deque[Message]] = defaultdict(
+            lambda: deque(maxlen=self._max_queue_size))
+        # Opt-in fast path: invoke local handlers synchronously instead of
+        # queueing. Off by default because it changes delivery timing from
+        # next-step to immediate.
+        self.direct_dispatch = False
+
+    def try_local_dispatch(self, sender: str, recipient: str, message_type: str,
+                           data: Dict[str, Any], timestamp: float = 0.0) -> bool:
+        """
+        Attempt to deliver a message synchronously to a local subscriber.
+
+        Only active when direct_dispatch is enabled and the recipient has a
+        registered handler; skips the queue round-trip and lets the caller
+        reuse an already-known timestamp instead of calling time.time().
+
+        Args:
+            sender: Agent ID of the message sender
+            recipient: Agent ID of the message recipient
+            message_type: Type of message being sent
+            data: Message payload data
+            timestamp: Timestamp to stamp on the message
+
+        Returns:
+            True if the message was dispatched, False if the caller should
+            fall back to publish()
+        """
+        if not self.direct_dispatch:
+            return False
+        handlers = self._subscribers.get(recipient)
+        if not handlers:
+            return False
+
+        message = Message(sender, recipient, message_type, data, timestamp)
+        for handler in handlers:
+            handler(message)
+        logger.debug("Directly dispatched %s to %s", message_type, recipient)
+        return True
+
     def subscribe(self, agent_id: str, message_handler: Callable[[Message], None]):
         """
         Subscribe an agent to receive messages.
@@ -28,8 +68,14 @@ class MessageBus:
             agent_id: Unique identifier for the agent
             message_handler: Function to handle incoming messages
         """
+        # Interned ids share one canonical string, so queue and subscriber
+        # lookups hash once and compare by identity
+        agent_id = sys.intern(agent_id)
         self._subscribers[agent_id].append(message_handler)
-        logger.debug(f"Agent {agent_id} subscribed to message bus")
+        # Touch the queue now so the defaultdict factory never runs inside
+        # the publish hot path for known agents
+        self._agent_queues[agent_id]
+        logger.debug("Agent %s subscribed to message bus", agent_id)
     
     def unsubscribe(self, agent_id: str):
         """
@@ -42,7 +88,7 @@ class MessageBus:
             del self._subscribers[agent_id]
         if agent_id in self._agent_queues:
             del self._agent_queues[agent_id]
-        logger.debug(f"Agent {agent_id} unsubscribed from message bus")
+        logger.debug("Agent %s unsubscribed from message bus", agent_id)
     
     def publish(self, message: Message):
         """
@@ -51,18 +97,45 @@ class MessageBus:
         Args:
             message: Message object to be delivered
         """
-        recipient = message.recipient
-        
-        # Add to recipient's queue
-        if len(self._agent_queues[recipient]) >= self._max_queue_size:
-            # FIFO dropping of oldest messages to prevent overflow
-            dropped_message = self._agent_queues[recipient].pop(0)
-            logger.warning(f"Dropped message for {recipient}: queue overflow")
-        
-        self._agent_queues[recipient].append(message)
-        logger.debug(f"Message queued for {recipient}: {message.message_type}")
-    
-    def deliver_messages(self, agent_id: str) -> List[Message]:
+        recipient = sys.intern(message.recipient)
+        queue = self._agent_queues[recipient]
+
+        # The bounded deque evicts the oldest message itself; just log it
+        if len(queue) == self._max_queue_size:
+            logger.warning("Dropped message for %s: queue overflow", recipient)
+
+        queue.append(message)
+        logger.debug("Message queued for %s: %s", recipient, message.message_type)
+
+    def publish_many(self, messages: List[Message]):
+        """
+        Publish a batch of messages in one call.
+
+        Amortizes the per-publish queue lookup by grouping messages by
+        recipient before appending, which helps senders that generate many
+        messages within a single simulation step.
+
+        Args:
+            messages: List of Message objects to be delivered
+        """
+        if not messages:
+            return
+
+        # Group messages by recipient so each queue is looked up once
+        by_recipient: Dict[str, List[Message]] = defaultdict(list)
+        for message in messages:
+            by_recipient[message.recipient].append(message)
+
+        for recipient, batch in by_recipient.items():
+            queue = self._agent_queues[recipient]
+            overflow = len(queue) + len(batch) - self._max_queue_size
+            if overflow > 0:
+                # The bounded deque evicts the oldest messages itself
+                logger.warning("Dropped %d messages for %s: queue overflow", overflow, recipient)
+            queue.extend(batch)
+            logger.debug("Queued %d messages for %s", len(batch), recipient)
+
+    def deliver_messages(self, agent_id: str) -> Deque[Message]:
         """
         Deliver all queued messages for a specific agent.
         
@@ -70,14 +143,18 @@ class MessageBus:
             agent_id: Agent to deliver messages to
             
         Returns:
-            List of messages for the agent
+            Iterable of messages for the agent
         """
-        messages = self._agent_queues[agent_id].copy()
-        self._agent_queues[agent_id].clear()
-        
+        # .get avoids materializing a queue for unknown or unsubscribed ids
+        messages = self._agent_queues.get(agent_id)
+        if messages is None:
+            return deque()
         if messages:
-            logger.debug(f"Delivering {len(messages)} messages to {agent_id}")
-        
+            # Detach the queue instead of copy+clear; the caller iterates
+            # the detached batch while new messages land in a fresh deque
+            self._agent_queues[agent_id] = deque(maxlen=self._max_queue_size)
+            logger.debug("Delivering %d messages to %s", len(messages), agent_id)
+
         return messages
     
     def get_queue_size(self, agent_id: str) -> int:
@@ -90,7 +167,8 @@ class MessageBus:
         Returns:
             Number of queued messages
         """
-        return len(self._agent_queues[agent_id])
+        queue = self._agent_queues.get(agent_id)
+        return len(queue) if queue is not None else 0
     
     def clear_all_queues(self):
         """Clear all message queues. Useful for simulation reset."""
@@ -1,9 +1,12 @@
 """
 Store Agent implementation for the supply chain simulator.
 """
+import re
 import time
+import random
 import logging
-from typing import Dict, Any
+import itertools
+from typing import Any, Dict, Iterator, Optional, Set
 from agents.base_agent import BaseAgent
 from models.message import Message
 from models.order import Order
@@ -11,6 +14,10 @@ from models.location import Location
 
 logger = logging.getLogger(__name__)
 
+# Pricing constants used on the per-product hot path
+UNIT_PRICE = 10.0  # Assumed revenue per unit sold
+STORAGE_COST_PER_UNIT = 0.1  # Storage cost per unit per time step
+
 
 class StoreAgent(BaseAgent):
     """
@@ -21,11 +28,15 @@ class StoreAgent(BaseAgent):
     - Process customer demand and decrease inventory
     - Receive deliveries and update inventory levels
     """
-    
+
+    __slots__ = ('inventory', 'reorder_threshold', 'reorder_quantity', 'pending_orders',
+                 '_pending_product_ids', '_pending_count', 'demand_rate', 'sales_revenue',
+                 'lost_sales', '_message_handlers', '_rng', '_order_seq', '_store_num')
+
     def __init__(self, agent_id: str, location: Location, message_bus, 
-                 initial_inventory: Dict[str, int] = None, 
+                 initial_inventory: Optional[Dict[str, int]] = None, 
                  reorder_threshold: int = 10,
-                 reorder_quantity: int = 50):
+                 reorder_quantity: int = 50) -> None:
         """
         Initialize Store Agent.
         
@@ -40,24 +51,47 @@ class StoreAgent(BaseAgent):
         super().__init__(agent_id, location, message_bus)
         
         # Store-specific state
-        self.inventory = initial_inventory or {}
-        self.reorder_threshold = reorder_threshold
-        self.reorder_quantity = reorder_quantity
-        self.pending_orders = {}  # {order_id: Order}
-        self.demand_rate = 1.0  # Base demand rate (customers per time step)
-        self.sales_revenue = 0.0
-        self.lost_sales = 0  # Track stockouts
+        self.inventory: Dict[str, int] = initial_inventory or {}
+        self.reorder_threshold: int = reorder_threshold
+        self.reorder_quantity: int = reorder_quantity
+        self.pending_orders: Dict[str, Order] = {}  # {order_id: Order}
+        # Products with at least one order in 'pending' status; lets the
+        # per-step reorder check skip scanning pending_orders
+        self._pending_product_ids: Set[str] = set()
+        # Running count of orders in 'pending' status, kept so metrics
+        # polls don't filter pending_orders on every call
+        self._pending_count: int = 0
+        self.demand_rate: float = 1.0  # Base demand rate (customers per time step)
+        self.sales_revenue: float = 0.0
+        self.lost_sales: int = 0  # Track stockouts
+
+        # O(1) message dispatch by type (bound methods, no per-message getattr)
+        self._message_handlers = {
+            "DELIVERY_NOTIFICATION": self._handle_delivery,
+            "DEMAND_UPDATE": self._handle_demand_update,
+            "ORDER_REJECTED": self._handle_order_rejection
+        }
+
+        # Dedicated RNG seeded from the agent id: demand draws are
+        # reproducible per store, independent of other agents and of any
+        # global random.seed() elsewhere in the process
+        self._rng = random.Random(agent_id)
+
+        # Monotonic sequence for order ids; timestamps can collide when
+        # several orders land in the same millisecond
+        self._order_seq: Iterator[int] = itertools.count(1)
+
+        # Parse the store number out of the agent id once; _place_order
+        # round-robins warehouses from it on every reorder
+        store_num_match = re.search(r'store_(\d+)', agent_id)
+        self._store_num: Optional[int] = int(store_num_match.group(1)) if store_num_match else None
         
         # Initialize state
-        self.update_state('inventory', self.inventory.copy())
-        self.update_state('pending_orders', len(self.pending_orders))
-        self.update_state('demand_rate', self.demand_rate)
-        self.update_state('sales_revenue', self.sales_revenue)
-        self.update_state('lost_sales', self.lost_sales)
+        self._update_state()
         
         logger.info(f"Store {self.agent_id} initialized with inventory: {self.inventory}")
     
-    def step(self):
+    def step(self) -> None:
         """Execute one simulation step for the store."""
         self.last_step_time = time.time()
         
@@ -69,94 +103,88 @@ class StoreAgent(BaseAgent):
         
         # Check inventory levels and place orders if needed
         self._check_and_reorder()
-        
-        # Update state for monitoring
-        self._update_state()
     
-    def handle_message(self, message: Message):
+    def handle_message(self, message: Message) -> None:
         """
         Handle incoming messages.
         
         Args:
             message: Message to process
         """
+        handler = self._message_handlers.get(message.message_type)
+        if handler is None:
+            logger.warning(f"Store {self.agent_id} received unknown message type: {message.message_type}")
+            return
         try:
-            if message.message_type == "DELIVERY_NOTIFICATION":
-                self._handle_delivery(message)
-            elif message.message_type == "DEMAND_UPDATE":
-                self._handle_demand_update(message)
-            elif message.message_type == "ORDER_REJECTED":
-                self._handle_order_rejection(message)
-            else:
-                logger.warning(f"Store {self.agent_id} received unknown message type: {message.message_type}")
+            handler(message)
         except Exception as e:
             logger.error(f"Error handling message in Store {self.agent_id}: {e}")
     
-    def _process_customer_demand(self):
+    def _process_customer_demand(self) -> None:
         """Process customer demand and update inventory."""
-        # Simple demand simulation - customers buy products based on demand rate
-        import random
-        for product_id in list(self.inventory.keys()):
-            # Calculate demand for this product (simple random variation around demand rate)
-            # Use a simple approach: demand_rate +/- random variation
-            variation = random.uniform(-0.5, 0.5)
-            demand = max(0, int(self.demand_rate + variation))
-            
-            if demand > 0:
-                available = self.inventory.get(product_id, 0)
-                sold = min(demand, available)
-                lost = demand - sold
-                
-                if sold > 0:
-                    self.inventory[product_id] = available - sold
-                    # Assume $10 per unit for revenue calculation
-                    unit_price = 10.0
-                    revenue = sold * unit_price
-                    self.sales_revenue += revenue
-                    
-                    # Record sale in performance tracker if available
-                    if hasattr(self, 'performance_tracker') and self.performance_tracker:
-                        self.performance_tracker.record_sale(
-                            self.agent_id, product_id, sold, unit_price
-                        )
-                    
-                    logger.debug(f"Store {self.agent_id} sold {sold} units of {product_id}")
-                
-                if lost > 0:
-                    self.lost_sales += lost
-                    lost_revenue = lost * 10.0  # Same unit price
-                    
-                    # Record stockout in performance tracker if available
-                    if hasattr(self, 'performance_tracker') and self.performance_tracker:
-                        self.performance_tracker.record_stockout(
-                            self.agent_id, product_id, lost, lost_revenue
-                        )
-                    
-                    logger.warning(f"Store {self.agent_id} lost {lost} sales of {product_id} due to stockout")
+        # Simple demand simulation - customers buy products based on demand
+        # rate. This loop runs for every product each step, so per-iteration
+        # lookups are hoisted and the revenue/lost totals are accumulated
+        # locally and written back once.
+        inventory = self.inventory
+        demand_rate = self.demand_rate
+        uniform = self._rng.uniform
+        tracker = self.performance_tracker  # None unless the web layer attached one
+        unit_price = UNIT_PRICE
+        revenue_total = 0.0
+        lost_total = 0
+
+        # Iterating items() directly is safe here: the loop only overwrites
+        # quantities, never adds or removes products
+        for product_id, available in inventory.items():
+            # Demand for this product: demand_rate +/- random variation
+            demand = int(demand_rate + uniform(-0.5, 0.5))
+            if demand <= 0:
+                continue
+
+            sold = demand if demand <= available else available
+            lost = demand - sold
+
+            if sold > 0:
+                inventory[product_id] = available - sold
+                revenue_total += sold * unit_price
+
+                # Record sale in performance tracker if available
+                if tracker is not None:
+                    tracker.record_sale(self.agent_id, product_id, sold, unit_price)
+
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Store %s sold %d units of %s", self.agent_id, sold, product_id)
+
+            if lost > 0:
+                lost_total += lost
+
+                # Record stockout in performance tracker if available
+                if tracker is not None:
+                    tracker.record_stockout(self.agent_id, product_id, lost, lost * unit_price)
+
+                logger.warning("Store %s lost %d sales of %s due to stockout",
+                               self.agent_id, lost, product_id)
+
+        if revenue_total:
+            self.sales_revenue += revenue_total
+        if lost_total:
+            self.lost_sales += lost_total
         
-        # Record storage costs for remaining inventory
-        if hasattr(self, 'performance_tracker') and self.performance_tracker:
-            for product_id, quantity in self.inventory.items():
-                if quantity > 0:
-                    storage_cost_per_unit = 0.1  # $0.10 per unit per time step
-                    self.performance_tracker.record_storage_cost(
-                        self.agent_id, product_id, quantity, storage_cost_per_unit
-                    )
+        # Record storage costs for remaining inventory in one call
+        if tracker is not None:
+            tracker.record_storage_costs_bulk(self.agent_id, inventory, STORAGE_COST_PER_UNIT)
     
-    def _check_and_reorder(self):
+    def _check_and_reorder(self) -> None:
         """Check inventory levels and place orders if below threshold."""
+        pending_products = self._pending_product_ids
+        threshold = self.reorder_threshold
         for product_id, quantity in self.inventory.items():
-            if quantity <= self.reorder_threshold:
-                # Check if we already have a pending order for this product
-                pending_for_product = any(
-                    order.product_id == product_id and order.status == 'pending'
-                    for order in self.pending_orders.values()
-                )
-                
-                if not pending_for_product:
-                    self._place_order(product_id, self.reorder_quantity)
+            # Skip products that already have a pending order
+            if quantity <= threshold and product_id not in pending_products:
+                self._place_order(product_id, self.reorder_quantity)
     
-    def _place_order(self, product_id: str, quantity: int):
+    def _place_order(self, product_id: str, quantity: int) -> None:
         """
         Place an order to the warehouse.
         
@@ -164,19 +192,19 @@ class StoreAgent(BaseAgent):
             product_id: Product to order
             quantity: Quantity to order
         """
-        order_id = f"{self.agent_id}_order_{int(time.time() * 1000)}"
-        order = Order(order_id, product_id, quantity, self.agent_id)
+        order_id = f"{self.agent_id}_order_{next(self._order_seq)}"
+        order = Order(order_id, product_id, quantity, self.agent_id,
+                      timestamp=self.last_step_time)
         
         self.pending_orders[order_id] = order
+        self._pending_product_ids.add(product_id)
+        self._pending_count += 1
         
         # Distribute orders between warehouses for better utilization
-        # Use simple round-robin based on store number
-        import re
-        store_num_match = re.search(r'store_(\d+)', self.agent_id)
-        if store_num_match:
-            store_num = int(store_num_match.group(1))
+        # Use simple round-robin based on the store number parsed at init
+        if self._store_num is not None:
             # Alternate between warehouse_1 and warehouse_2
-            warehouse_id = f"warehouse_{1 + (store_num % 2)}"
+            warehouse_id = f"warehouse_{1 + (self._store_num % 2)}"
         else:
             warehouse_id = "warehouse_1"  # Default fallback
         
@@ -191,7 +219,7 @@ class StoreAgent(BaseAgent):
         self.send_message(warehouse_id, "ORDER_REQUEST", order_data)
         logger.info(f"Store {self.agent_id} placed order {order_id} for {quantity} units of {product_id} to {warehouse_id}")
     
-    def _handle_delivery(self, message: Message):
+    def _handle_delivery(self, message: Message) -> None:
         """
         Handle delivery notification from warehouse.
         
@@ -209,13 +237,17 @@ class StoreAgent(BaseAgent):
             self.inventory[product_id] = current_inventory + quantity
             
             # Mark order as delivered
-            self.pending_orders[order_id].update_status('delivered')
+            order = self.pending_orders[order_id]
+            if order.status == 'pending':
+                self._pending_count -= 1
+            order.update_status('delivered')
+            self._clear_pending_product(product_id)
             
             logger.info(f"Store {self.agent_id} received delivery: {quantity} units of {product_id}")
         else:
             logger.warning(f"Store {self.agent_id} received delivery for unknown order: {order_id}")
     
-    def _handle_demand_update(self, message: Message):
+    def _handle_demand_update(self, message: Message) -> None:
         """
         Handle demand update from market agent.
         
@@ -228,7 +260,7 @@ class StoreAgent(BaseAgent):
         self.demand_rate = max(0, new_demand_rate)  # Ensure non-negative
         logger.info(f"Store {self.agent_id} updated demand rate to {self.demand_rate}")
     
-    def _handle_order_rejection(self, message: Message):
+    def _handle_order_rejection(self, message: Message) -> None:
         """
         Handle order rejection from warehouse.
         
@@ -240,17 +272,50 @@ class StoreAgent(BaseAgent):
         reason = data.get('reason', 'Unknown')
         
         if order_id in self.pending_orders:
-            self.pending_orders[order_id].update_status('cancelled')
+            order = self.pending_orders[order_id]
+            if order.status == 'pending':
+                self._pending_count -= 1
+            order.update_status('cancelled')
+            self._clear_pending_product(order.product_id)
             logger.warning(f"Store {self.agent_id} order {order_id} rejected: {reason}")
     
-    def _update_state(self):
+    def _clear_pending_product(self, product_id: str) -> None:
+        """
+        Drop a product from the pending set if no pending orders remain
+        for it. Runs only when an order settles, not on the per-step path.
+
+        Args:
+            product_id: Product whose pending orders were just updated
+        """
+        for order in self.pending_orders.values():
+            if order.product_id == product_id and order.status == 'pending':
+                return
+        self._pending_product_ids.discard(product_id)
+
+    def _update_state(self) -> None:
         """Update agent state for monitoring."""
-        self.update_state('inventory', self.inventory.copy())
-        self.update_state('pending_orders', len(self.pending_orders))
-        self.update_state('demand_rate', self.demand_rate)
-        self.update_state('sales_revenue', self.sales_revenue)
-        self.update_state('lost_sales', self.lost_sales)
+        # The inventory entry is the live dict (not a copy); monitoring
+        # consumers only read it before serializing
+        self.update_state_bulk({
+            'inventory': self.inventory,
+            'pending_orders': len(self.pending_orders),
+            'demand_rate': self.demand_rate,
+            'sales_revenue': self.sales_revenue,
+            'lost_sales': self.lost_sales
+        })
     
+    def get_agent_info(self) -> Dict[str, Any]:
+        """
+        Get basic information about this agent, refreshing monitoring state
+        on demand. State is computed when polled rather than every step, so
+        fast-running simulations don't pay for snapshots nobody reads.
+
+        Returns:
+            Dictionary with agent information
+        """
+        self._update_state()
+        return super().get_agent_info()
+
     def get_inventory_level(self, product_id: str) -> int:
         """
         Get current inventory level for a product.
@@ -263,7 +328,7 @@ class StoreAgent(BaseAgent):
         """
         return self.inventory.get(product_id, 0)
     
-    def add_product(self, product_id: str, initial_quantity: int = 0):
+    def add_product(self, product_id: str, initial_quantity: int = 0) -> None:
         """
         Add a new product to the store's inventory.
         
@@ -279,16 +344,16 @@ class StoreAgent(BaseAgent):
         Get performance metrics for this store.
         
         Returns:
-            Dictionary with performance metrics
+            Dictionary with performance metrics. The inventory entry
+            references the live dict; callers must not mutate it.
         """
         total_inventory = sum(self.inventory.values())
-        pending_order_count = len([o for o in self.pending_orders.values() if o.status == 'pending'])
         
         return {
             'sales_revenue': self.sales_revenue,
             'lost_sales': self.lost_sales,
             'total_inventory': total_inventory,
-            'pending_orders': pending_order_count,
+            'pending_orders': self._pending_count,
             'demand_rate': self.demand_rate,
-            'inventory_by_product': self.inventory.copy()
+            'inventory_by_product': self.inventory
         }
\ No newline at end of file
@@ -1,6 +1,7 @@
 """
 Truck Agent implementation for the supply chain simulator.
 """
+import sys
 import time
 import logging
 from typing import Dict, Any, Optional
@@ -10,6 +11,15 @@ from models.location import Location
 
 logger = logging.getLogger(__name__)
 
+# Canonical status values. Interned module-level constants mean every
+# assignment and comparison shares one string object, so == resolves on
+# the identity fast path before falling back to character comparison.
+STATUS_AVAILABLE = sys.intern('available')
+STATUS_MOVING_TO_PICKUP = sys.intern('moving_to_pickup')
+STATUS_LOADING = sys.intern('loading')
+STATUS_MOVING_TO_DELIVERY = sys.intern('moving_to_delivery')
+STATUS_UNLOADING = sys.intern('unloading')
+
 
 class TruckAgent(BaseAgent):
     """
@@ -21,7 +31,15 @@ class TruckAgent(BaseAgent):
     - Track current position and destination
     - Notify relevant agents when deliveries are complete
     """
-    
+
+    __slots__ = ('city_map', 'speed', 'capacity', 'current_location_id',
+                 'destination_location_id', 'status', 'cargo', 'current_cargo_weight',
+                 'current_order', 'pickup_location_id', 'delivery_location_id',
+                 'dispatcher_id', 'movement_progress', 'total_distance',
+                 'remaining_distance', '_seg_from', '_seg_to', 'deliveries_completed',
+                 'total_distance_traveled', 'total_cargo_delivered',
+                 '_message_handlers', '_status_actions')
+
     def __init__(self, agent_id: str, location: Location, message_bus,
                  city_map, speed: float = 10.0, capacity: int = 100):
         """
@@ -44,7 +62,7 @@ class TruckAgent(BaseAgent):
         # Truck state
         self.current_location_id = location.location_id
         self.destination_location_id = None
-        self.status = 'available'  # 'available', 'moving_to_pickup', 'loading', 'moving_to_delivery', 'unloading'
+        self.status = STATUS_AVAILABLE  # See the STATUS_* constants above
         
         # Cargo management
         self.cargo = {}  # {product_id: quantity}
@@ -60,11 +78,29 @@ class TruckAgent(BaseAgent):
         self.movement_progress = 0.0  # Progress towards destination (0.0 to 1.0)
         self.total_distance = 0.0
         self.remaining_distance = 0.0
+        # Endpoint coordinates of the current movement segment, cached when
+        # movement starts so interpolation needs no map lookups per step
+        self._seg_from = None  # (x, y) of the segment origin
+        self._seg_to = None  # (x, y) of the segment destination
         
         # Performance tracking
         self.deliveries_completed = 0
         self.total_distance_traveled = 0.0
         self.total_cargo_delivered = 0
+
+        # O(1) message dispatch by type (bound methods, no per-message getattr)
+        self._message_handlers = {
+            "DISPATCH_ORDER": self._handle_dispatch_order
+        }
+
+        # Per-status step actions (bound methods); one dict lookup replaces
+        # the chained status comparisons in step(). 'available' has no action.
+        self._status_actions = {
+            STATUS_MOVING_TO_PICKUP: self._step_moving_to_pickup,
+            STATUS_LOADING: self._complete_loading,
+            STATUS_MOVING_TO_DELIVERY: self._step_moving_to_delivery,
+            STATUS_UNLOADING: self._complete_unloading
+        }
         
         # Initialize state
         self._update_state()
@@ -79,24 +115,9 @@ class TruckAgent(BaseAgent):
         self.process_messages()
         
         # Execute behavior based on current status
-        if self.status == 'moving_to_pickup':
-            self._move_towards_destination()
-            if self._has_reached_destination():
-                self._arrive_at_pickup()
-        
-        elif self.status == 'loading':
-            self._complete_loading()
-        
-        elif self.status == 'moving_to_delivery':
-            self._move_towards_destination()
-            if self._has_reached_destination():
-                self._arrive_at_delivery()
-        
-        elif self.status == 'unloading':
-            self._complete_unloading()
-        
-        # Update state for monitoring
-        self._update_state()
+        action = self._status_actions.get(self.status)
+        if action is not None:
+            action()
     
     def handle_message(self, message: Message):
         """
@@ -105,11 +126,12 @@ class TruckAgent(BaseAgent):
         Args:
             message: Message to process
         """
+        handler = self._message_handlers.get(message.message_type)
+        if handler is None:
+            logger.warning(f"Truck {self.agent_id} received unknown message type: {message.message_type}")
+            return
         try:
-            if message.message_type == "DISPATCH_ORDER":
-                self._handle_dispatch_order(message)
-            else:
-                logger.warning(f"Truck {self.agent_id} received unknown message type: {message.message_type}")
+            handler(message)
         except Exception as e:
             logger.error(f"Error handling message in Truck {self.agent_id}: {e}")
     
@@ -120,7 +142,7 @@ class TruckAgent(BaseAgent):
         Args:
             message: Dispatch order message
         """
-        if self.status != 'available':
+        if self.status != STATUS_AVAILABLE:
             logger.warning(f"Truck {self.agent_id} received dispatch order but is not available (status: {self.status})")
             return
         
@@ -165,7 +187,7 @@ class TruckAgent(BaseAgent):
     def _start_movement_to_pickup(self):
         """Start movement towards pickup location."""
         self.destination_location_id = self.pickup_location_id
-        self.status = 'moving_to_pickup'
+        self.status = STATUS_MOVING_TO_PICKUP
         self.movement_progress = 0.0
         
         # Calculate distance
@@ -180,12 +202,14 @@ class TruckAgent(BaseAgent):
             self._reset_to_available()
             return
         
+        self._cache_segment_coords()
+        
         logger.info(f"Truck {self.agent_id} starting movement to pickup at {self.pickup_location_id} (distance: {self.total_distance:.1f})")
     
     def _start_movement_to_delivery(self):
         """Start movement towards delivery location."""
         self.destination_location_id = self.delivery_location_id
-        self.status = 'moving_to_delivery'
+        self.status = STATUS_MOVING_TO_DELIVERY
         self.movement_progress = 0.0
         
         # Calculate distance
@@ -200,21 +224,59 @@ class TruckAgent(BaseAgent):
             self._reset_to_available()
             return
         
+        self._cache_segment_coords()
+        
         logger.info(f"Truck {self.agent_id} starting movement to delivery at {self.delivery_location_id} (distance: {self.total_distance:.1f})")
     
-    def _move_towards_destination(self):
-        """Move towards the current destination."""
-        if self.total_distance <= 0:
-            return
-        
-        # Calculate movement for this step
-        distance_this_step = min(self.speed, self.remaining_distance)
-        self.remaining_distance -= distance_this_step
-        self.movement_progress = 1.0 - (self.remaining_distance / self.total_distance)
+    def _step_moving_to_pickup(self):
+        """Advance towards the pickup location, arriving when close enough."""
+        if self._move_towards_destination():
+            self._arrive_at_pickup()
+
+    def _step_moving_to_delivery(self):
+        """Advance towards the delivery location, arriving when close enough."""
+        if self._move_towards_destination():
+            self._arrive_at_delivery()
+
+    def _cache_segment_coords(self):
+        """Cache the endpoint coordinates of the current movement segment."""
+        origin = self.city_map.get_location(self.current_location_id)
+        destination = self.city_map.get_location(self.destination_location_id)
+        if origin and destination:
+            self._seg_from = (origin.x, origin.y)
+            self._seg_to = (destination.x, destination.y)
+        else:
+            self._seg_from = self._seg_to = None
+
+    def _move_towards_destination(self) -> bool:
+        """
+        Move towards the current destination.
+
+        Returns:
+            True if the truck has reached its destination this step
+        """
+        total_distance = self.total_distance
+        if total_distance <= 0:
+            return True
+
+        # Calculate movement for this step; kinematics use locals and write
+        # each attribute once since this runs for every moving truck per tick
+        remaining = self.remaining_distance
+        distance_this_step = self.speed
+        if distance_this_step > remaining:
+            distance_this_step = remaining
+        remaining -= distance_this_step
+
+        self.remaining_distance = remaining
+        self.movement_progress = 1.0 - (remaining / total_distance)
         self.total_distance_traveled += distance_this_step
-        
-        logger.debug(f"Truck {self.agent_id} moved {distance_this_step:.1f} units, {self.remaining_distance:.1f} remaining")
-    
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Truck %s moved %.1f units, %.1f remaining",
+                         self.agent_id, distance_this_step, remaining)
+
+        return remaining <= 0.01  # Small tolerance for floating point precision
+
     def _has_reached_destination(self) -> bool:
         """Check if truck has reached its destination."""
         return self.remaining_distance <= 0.01  # Small tolerance for floating point precision
@@ -222,7 +284,7 @@ class TruckAgent(BaseAgent):
     def _arrive_at_pickup(self):
         """Handle arrival at pickup location."""
         self.current_location_id = self.pickup_location_id
-        self.status = 'loading'
+        self.status = STATUS_LOADING
         self.movement_progress = 1.0
         self.remaining_distance = 0.0
         
@@ -268,7 +330,7 @@ class TruckAgent(BaseAgent):
     def _arrive_at_delivery(self):
         """Handle arrival at delivery location."""
         self.current_location_id = self.delivery_location_id
-        self.status = 'unloading'
+        self.status = STATUS_UNLOADING
         self.movement_progress = 1.0
         self.remaining_distance = 0.0
         
@@ -330,7 +392,7 @@ class TruckAgent(BaseAgent):
     
     def _reset_to_available(self):
         """Reset truck to available status."""
-        self.status = 'available'
+        self.status = STATUS_AVAILABLE
         self.current_order = None
         self.pickup_location_id = None
         self.delivery_location_id = None
@@ -339,6 +401,7 @@ class TruckAgent(BaseAgent):
         self.movement_progress = 0.0
         self.total_distance = 0.0
         self.remaining_distance = 0.0
+        self._seg_from = self._seg_to = None
         
         # Notify dispatcher that truck is available
         if self.dispatcher_id:
@@ -348,20 +411,36 @@ class TruckAgent(BaseAgent):
     
     def _update_state(self):
         """Update agent state for monitoring."""
-        self.update_state('status', self.status)
-        self.update_state('current_location_id', self.current_location_id)
-        self.update_state('destination_location_id', self.destination_location_id)
-        self.update_state('movement_progress', self.movement_progress)
-        self.update_state('remaining_distance', self.remaining_distance)
-        self.update_state('cargo', self.cargo.copy())
-        self.update_state('current_cargo_weight', self.current_cargo_weight)
-        self.update_state('current_order', self.current_order)
-        self.update_state('deliveries_completed', self.deliveries_completed)
-        self.update_state('total_distance_traveled', self.total_distance_traveled)
-        self.update_state('total_cargo_delivered', self.total_cargo_delivered)
-        self.update_state('capacity', self.capacity)
-        self.update_state('interpolated_position', self.get_interpolated_position())
+        # The cargo entry is the live dict (not a copy); monitoring
+        # consumers only read it before serializing
+        self.update_state_bulk({
+            'status': self.status,
+            'current_location_id': self.current_location_id,
+            'destination_location_id': self.destination_location_id,
+            'movement_progress': self.movement_progress,
+            'remaining_distance': self.remaining_distance,
+            'cargo': self.cargo,
+            'current_cargo_weight': self.current_cargo_weight,
+            'current_order': self.current_order,
+            'deliveries_completed': self.deliveries_completed,
+            'total_distance_traveled': self.total_distance_traveled,
+            'total_cargo_delivered': self.total_cargo_delivered,
+            'capacity': self.capacity,
+            'interpolated_position': self.get_interpolated_position()
+        })
     
+    def get_agent_info(self) -> Dict[str, Any]:
+        """
+        Get basic information about this agent, refreshing monitoring state
+        on demand. State is computed when polled rather than every step, so
+        fast-running simulations don't pay for snapshots nobody reads.
+
+        Returns:
+            Dictionary with agent information
+        """
+        self._update_state()
+        return super().get_agent_info()
+
     def get_current_location(self) -> Location:
         """
         Get the current location object.
@@ -378,24 +457,20 @@ class TruckAgent(BaseAgent):
         Returns:
             Dictionary with position information
         """
-        if self.status in ['moving_to_pickup', 'moving_to_delivery'] and self.destination_location_id:
-            current_loc = self.city_map.get_location(self.current_location_id)
-            dest_loc = self.city_map.get_location(self.destination_location_id)
+        if self._seg_to is not None and self.status in (STATUS_MOVING_TO_PICKUP, STATUS_MOVING_TO_DELIVERY):
+            # Interpolate along the cached segment endpoints
+            from_x, from_y = self._seg_from
+            to_x, to_y = self._seg_to
+            progress = self.movement_progress
             
-            if current_loc and dest_loc:
-                # Calculate interpolated position
-                progress = self.movement_progress
-                x = current_loc.x + (dest_loc.x - current_loc.x) * progress
-                y = current_loc.y + (dest_loc.y - current_loc.y) * progress
-                
-                return {
-                    'x': x,
-                    'y': y,
-                    'from_location': self.current_location_id,
-                    'to_location': self.destination_location_id,
-                    'progress': progress,
-                    'is_moving': True
-                }
+            return {
+                'x': from_x + (to_x - from_x) * progress,
+                'y': from_y + (to_y - from_y) * progress,
+                'from_location': self.current_location_id,
+                'to_location': self.destination_location_id,
+                'progress': progress,
+                'is_moving': True
+            }
         
         # Return current location if not moving
         current_loc = self.get_current_location()
@@ -415,7 +490,7 @@ class TruckAgent(BaseAgent):
         Returns:
             True if truck is available, False otherwise
         """
-        return self.status == 'available'
+        return self.status == STATUS_AVAILABLE
     
     def get_cargo_capacity_remaining(self) -> int:
         """
@@ -3,7 +3,9 @@ Warehouse Agent implementation for the supply chain simulator.
 """
 import time
 import logging
-from typing import Dict, Any, List
+import itertools
+from collections import deque
+from typing import Dict, Any, Deque, List, Set
 from agents.base_agent import BaseAgent
 from models.message import Message
 from models.order import Order
@@ -45,6 +47,12 @@ class WarehouseAgent(BaseAgent):
         
         # Warehouse-specific state
         self.inventory = initial_inventory or {}
+        # Running unit total, adjusted at every inventory write so metrics
+        # reads don't rescan the dict
+        self._total_inventory = sum(self.inventory.values())
+        # Bumped on every inventory write; keys the metrics cache so
+        # mutations that cancel out in the counters still invalidate it
+        self._inventory_version = 0
         self.reorder_threshold = reorder_threshold
         self.reorder_quantity = reorder_quantity
         self.max_trucks = max_trucks
@@ -53,26 +61,58 @@ class WarehouseAgent(BaseAgent):
         self.pending_store_orders = {}  # {order_id: Order} - orders from stores
         self.pending_factory_orders = {}  # {order_id: Order} - orders to factories
         self.processing_orders = {}  # {order_id: Order} - orders being processed
+        # Products with an outstanding factory order; lets the per-step
+        # reorder check skip scanning pending_factory_orders
+        self._pending_factory_products = set()
+        # Products at or below the reorder threshold, maintained by
+        # _adjust_inventory so the reorder check doesn't walk every SKU
+        self._low_stock_candidates: Set[str] = {
+            product_id for product_id, quantity in self.inventory.items()
+            if quantity <= reorder_threshold
+        }
         
-        # Truck management
-        self.available_trucks = []  # List of available truck agent IDs
-        self.assigned_trucks = {}  # {truck_id: order_id} - truck assignments
-        
+        # Truck management. Trucks are handled by integer index internally
+        # (the id strings exist only at the message boundary); dispatch pops
+        # from the left of a deque in O(1) and the parallel set gives O(1)
+        # membership checks on return
+        self._truck_ids = [f"truck_{agent_id}_{i}" for i in range(1, max_trucks + 1)]
+        self._truck_idx = {truck_id: idx for idx, truck_id in enumerate(self._truck_ids)}
+        self.available_trucks: Deque[int] = deque(range(max_trucks))
+        self._available_truck_set: Set[int] = set(range(max_trucks))
+        self.assigned_trucks: Dict[int, str] = {}  # {truck_idx: order_id}
+        
+        # Monotonic sequence for factory order ids; timestamps can collide
+        # when several orders land in the same millisecond
+        self._factory_order_seq = itertools.count(1)
+
         # Performance tracking
         self.orders_processed = 0
         self.orders_fulfilled = 0
         self.orders_rejected = 0
-        
-        # Initialize available trucks (assuming truck IDs follow pattern)
-        for i in range(1, max_trucks + 1):
-            truck_id = f"truck_{self.agent_id}_{i}"
-            self.available_trucks.append(truck_id)
+
+        # Memoized get_performance_metrics result; the key tuple covers
+        # every mutation path, so dashboards polling between changes hit a
+        # tuple compare instead of recomputing
+        self._metrics_cache_key = None
+        self._metrics_cache = None
+
+        # Dispatches, rejections and notifications fan out in bursts; batch
+        # them into a single publish_many call per step
+        self._batch_outbound = True
+
+        # O(1) message dispatch by type (bound methods, no per-message getattr)
+        self._message_handlers = {
+            "ORDER_REQUEST": self._handle_store_order,
+            "DELIVERY_COMPLETE": self._handle_delivery_complete,
+            "PRODUCTION_COMPLETE": self._handle_production_complete,
+            "TRUCK_AVAILABLE": self._handle_truck_available
+        }
         
         # Initialize state
         self._update_state()
         
-        logger.info(f"Warehouse {self.agent_id} initialized with inventory: {self.inventory}")
-        logger.info(f"Warehouse {self.agent_id} managing trucks: {self.available_trucks}")
+        logger.info("Warehouse %s initialized with inventory: %s", self.agent_id, self.inventory)
+        logger.info("Warehouse %s managing trucks: %s", self.agent_id, self._truck_ids)
     
     def step(self):
         """Execute one simulation step for the warehouse."""
@@ -89,9 +129,9 @@ class WarehouseAgent(BaseAgent):
         
         # Record storage costs for inventory
         self._record_storage_costs()
-        
-        # Update state for monitoring
-        self._update_state()
+
+        # Publish this step's batched dispatches and notifications in one call
+        self.flush_outbox()
     
     def handle_message(self, message: Message):
         """
@@ -100,19 +140,14 @@ class WarehouseAgent(BaseAgent):
         Args:
             message: Message to process
         """
+        handler = self._message_handlers.get(message.message_type)
+        if handler is None:
+            logger.warning("Warehouse %s received unknown message type: %s", self.agent_id, message.message_type)
+            return
         try:
-            if message.message_type == "ORDER_REQUEST":
-                self._handle_store_order(message)
-            elif message.message_type == "DELIVERY_COMPLETE":
-                self._handle_delivery_complete(message)
-            elif message.message_type == "PRODUCTION_COMPLETE":
-                self._handle_production_complete(message)
-            elif message.message_type == "TRUCK_AVAILABLE":
-                self._handle_truck_available(message)
-            else:
-                logger.warning(f"Warehouse {self.agent_id} received unknown message type: {message.message_type}")
+            handler(message)
         except Exception as e:
-            logger.error(f"Error handling message in Warehouse {self.agent_id}: {e}")
+            logger.error("Error handling message in Warehouse %s: %s", self.agent_id, e)
     
     def _handle_store_order(self, message: Message):
         """
@@ -128,44 +163,66 @@ class WarehouseAgent(BaseAgent):
         requester = data.get('requester')
         delivery_location = data.get('delivery_location')
         
-        # Create order object
-        order = Order(order_id, product_id, quantity, requester)
+        # Create order object, stamped with this step's cached wall time
+        order = Order(order_id, product_id, quantity, requester,
+                      timestamp=self.last_step_time)
         order.delivery_location = delivery_location  # Add delivery location to order
         
         # Add to pending orders
         self.pending_store_orders[order_id] = order
         self.orders_processed += 1
         
-        logger.info(f"Warehouse {self.agent_id} received order {order_id} for {quantity} units of {product_id} from {requester}")
+        logger.info("Warehouse %s received order %s for %d units of %s from %s",
+                    self.agent_id, order_id, quantity, product_id, requester)
     
     def _process_pending_orders(self):
         """Process pending store orders by checking inventory and dispatching trucks."""
-        orders_to_remove = []
+        pending = self.pending_store_orders
+        if not pending:
+            return
+        
+        # Drain in one pass: detach the dict, re-insert only orders that
+        # must stay pending. Avoids the collect-then-delete second pass and
+        # keeps FIFO fairness since dicts preserve insertion order.
+        self.pending_store_orders = still_pending = {}
         
-        for order_id, order in self.pending_store_orders.items():
+        for order_id, order in pending.items():
             if self._can_fulfill_order(order):
                 if self._dispatch_truck_for_order(order):
                     # Move order to processing
                     self.processing_orders[order_id] = order
                     order.update_status('processing')
-                    orders_to_remove.append(order_id)
                     self.orders_fulfilled += 1
                     
                     # Reduce inventory
-                    current_inventory = self.inventory.get(order.product_id, 0)
-                    self.inventory[order.product_id] = current_inventory - order.quantity
+                    self._adjust_inventory(order.product_id, -order.quantity)
                     
-                    logger.info(f"Warehouse {self.agent_id} dispatched truck for order {order_id}")
-                # If no truck available, order stays pending
+                    logger.info("Warehouse %s dispatched truck for order %s", self.agent_id, order_id)
+                else:
+                    # No truck available, order stays pending
+                    still_pending[order_id] = order
             else:
                 # Cannot fulfill order - reject it
                 self._reject_order(order)
-                orders_to_remove.append(order_id)
                 self.orders_rejected += 1
+    
+    def _adjust_inventory(self, product_id: str, delta: int):
+        """
+        Apply an inventory delta, keeping the running unit total in sync.
+        All inventory writes on the order paths go through here.
         
-        # Remove processed orders from pending
-        for order_id in orders_to_remove:
-            del self.pending_store_orders[order_id]
+        Args:
+            product_id: Product to adjust
+            delta: Units to add (negative to remove)
+        """
+        new_quantity = self.inventory.get(product_id, 0) + delta
+        self.inventory[product_id] = new_quantity
+        self._total_inventory += delta
+        self._inventory_version += 1
+        if new_quantity <= self.reorder_threshold:
+            self._low_stock_candidates.add(product_id)
+        else:
+            self._low_stock_candidates.discard(product_id)
     
     def _can_fulfill_order(self, order: Order) -> bool:
         """
@@ -191,12 +248,15 @@ class WarehouseAgent(BaseAgent):
             True if truck was dispatched, False if no trucks available
         """
         if not self.available_trucks:
-            logger.warning(f"Warehouse {self.agent_id} has no available trucks for order {order.order_id}")
+            logger.warning("Warehouse %s has no available trucks for order %s",
+                           self.agent_id, order.order_id)
             return False
         
         # Get an available truck
-        truck_id = self.available_trucks.pop(0)
-        self.assigned_trucks[truck_id] = order.order_id
+        truck_idx = self.available_trucks.popleft()
+        self._available_truck_set.discard(truck_idx)
+        self.assigned_trucks[truck_idx] = order.order_id
+        truck_id = self._truck_ids[truck_idx]
         
         # Send dispatch message to truck
         dispatch_data = {
@@ -209,7 +269,8 @@ class WarehouseAgent(BaseAgent):
         }
         
         self.send_message(truck_id, "DISPATCH_ORDER", dispatch_data)
-        logger.info(f"Warehouse {self.agent_id} dispatched truck {truck_id} for order {order.order_id}")
+        logger.info("Warehouse %s dispatched truck %s for order %s",
+                    self.agent_id, truck_id, order.order_id)
         
         return True
     
@@ -226,7 +287,8 @@ class WarehouseAgent(BaseAgent):
         }
         
         self.send_message(order.requester, "ORDER_REJECTED", rejection_data)
-        logger.warning(f"Warehouse {self.agent_id} rejected order {order.order_id}: insufficient inventory")
+        logger.warning("Warehouse %s rejected order %s: insufficient inventory",
+                       self.agent_id, order.order_id)
     
     def _handle_delivery_complete(self, message: Message):
         """
@@ -236,13 +298,15 @@ class WarehouseAgent(BaseAgent):
             message: Delivery completion message
         """
         data = message.data
-        truck_id = message.sender
+        truck_idx = self._truck_idx.get(message.sender)
         order_id = data.get('order_id')
         
         # Mark truck as available again
-        if truck_id in self.assigned_trucks:
-            del self.assigned_trucks[truck_id]
-            self.available_trucks.append(truck_id)
+        if truck_idx is not None and truck_idx in self.assigned_trucks:
+            del self.assigned_trucks[truck_idx]
+            if truck_idx not in self._available_truck_set:
+                self.available_trucks.append(truck_idx)
+                self._available_truck_set.add(truck_idx)
         
         # Update order status and notify store
         if order_id in self.processing_orders:
@@ -261,20 +325,20 @@ class WarehouseAgent(BaseAgent):
             # Remove from processing orders
             del self.processing_orders[order_id]
             
-            logger.info(f"Warehouse {self.agent_id} completed delivery for order {order_id}")
+            logger.info("Warehouse %s completed delivery for order %s", self.agent_id, order_id)
     
     def _check_and_reorder_from_factory(self):
         """Check inventory levels and place orders with factory if needed."""
-        for product_id, quantity in self.inventory.items():
-            if quantity <= self.reorder_threshold:
-                # Check if we already have a pending factory order for this product
-                pending_for_product = any(
-                    order.product_id == product_id and order.status == 'pending'
-                    for order in self.pending_factory_orders.values()
-                )
-                
-                if not pending_for_product:
-                    self._place_factory_order(product_id, self.reorder_quantity)
+        candidates = self._low_stock_candidates
+        if not candidates:
+            return
+        pending_products = self._pending_factory_products
+        # Iterate a snapshot: _place_factory_order doesn't mutate the set,
+        # but keeping the loop detached is cheap and future-proof
+        for product_id in tuple(candidates):
+            # Skip products that already have an outstanding factory order
+            if product_id not in pending_products:
+                self._place_factory_order(product_id, self.reorder_quantity)
     
     def _place_factory_order(self, product_id: str, quantity: int):
         """
@@ -284,10 +348,12 @@ class WarehouseAgent(BaseAgent):
             product_id: Product to order
             quantity: Quantity to order
         """
-        order_id = f"{self.agent_id}_factory_order_{int(time.time() * 1000)}"
-        order = Order(order_id, product_id, quantity, self.agent_id)
+        order_id = f"{self.agent_id}_factory_order_{next(self._factory_order_seq)}"
+        order = Order(order_id, product_id, quantity, self.agent_id,
+                      timestamp=self.last_step_time)
         
         self.pending_factory_orders[order_id] = order
+        self._pending_factory_products.add(product_id)
         
         # Send order to factory (assuming factory_1 for simplicity)
         factory_id = "factory_1"  # In a real system, this would be determined by routing logic
@@ -300,7 +366,8 @@ class WarehouseAgent(BaseAgent):
         }
         
         self.send_message(factory_id, "FACTORY_ORDER", factory_order_data)
-        logger.info(f"Warehouse {self.agent_id} placed factory order {order_id} for {quantity} units of {product_id}")
+        logger.info("Warehouse %s placed factory order %s for %d units of %s",
+                    self.agent_id, order_id, quantity, product_id)
     
     def _handle_production_complete(self, message: Message):
         """
@@ -316,17 +383,32 @@ class WarehouseAgent(BaseAgent):
         
         if order_id in self.pending_factory_orders:
             # Update inventory
-            current_inventory = self.inventory.get(product_id, 0)
-            self.inventory[product_id] = current_inventory + quantity
+            self._adjust_inventory(product_id, quantity)
             
             # Mark factory order as delivered
             self.pending_factory_orders[order_id].update_status('delivered')
             del self.pending_factory_orders[order_id]
+            self._clear_pending_factory_product(product_id)
             
-            logger.info(f"Warehouse {self.agent_id} received production: {quantity} units of {product_id}")
+            logger.info("Warehouse %s received production: %d units of %s",
+                        self.agent_id, quantity, product_id)
         else:
-            logger.warning(f"Warehouse {self.agent_id} received production for unknown order: {order_id}")
+            logger.warning("Warehouse %s received production for unknown order: %s",
+                           self.agent_id, order_id)
     
+    def _clear_pending_factory_product(self, product_id: str):
+        """
+        Drop a product from the pending-factory set if no outstanding orders
+        remain for it. Runs only when an order settles, not per step.
+
+        Args:
+            product_id: Product whose factory order was just resolved
+        """
+        for order in self.pending_factory_orders.values():
+            if order.product_id == product_id and order.status == 'pending':
+                return
+        self._pending_factory_products.discard(product_id)
+
     def _handle_truck_available(self, message: Message):
         """
         Handle truck becoming available (alternative to delivery complete).
@@ -334,27 +416,48 @@ class WarehouseAgent(BaseAgent):
         Args:
             message: Truck available message
         """
-        truck_id = message.sender
+        truck_idx = self._truck_idx.get(message.sender)
+        if truck_idx is None:
+            logger.warning("Warehouse %s ignoring unknown truck %s", self.agent_id, message.sender)
+            return
         
         # Mark truck as available if it was assigned
-        if truck_id in self.assigned_trucks:
-            del self.assigned_trucks[truck_id]
+        if truck_idx in self.assigned_trucks:
+            del self.assigned_trucks[truck_idx]
         
-        if truck_id not in self.available_trucks:
-            self.available_trucks.append(truck_id)
-            logger.info(f"Warehouse {self.agent_id} truck {truck_id} is now available")
+        if truck_idx not in self._available_truck_set:
+            self.available_trucks.append(truck_idx)
+            self._available_truck_set.add(truck_idx)
+            logger.info("Warehouse %s truck %s is now available", self.agent_id, message.sender)
     
     def _update_state(self):
         """Update agent state for monitoring."""
-        self.update_state('inventory', self.inventory.copy())
-        self.update_state('pending_store_orders', len(self.pending_store_orders))
-        self.update_state('pending_factory_orders', len(self.pending_factory_orders))
-        self.update_state('processing_orders', len(self.processing_orders))
-        self.update_state('available_trucks', len(self.available_trucks))
-        self.update_state('assigned_trucks', len(self.assigned_trucks))
-        self.update_state('orders_processed', self.orders_processed)
-        self.update_state('orders_fulfilled', self.orders_fulfilled)
-        self.update_state('orders_rejected', self.orders_rejected)
+        # The inventory entry is the live dict (not a copy); monitoring
+        # consumers only read it before serializing
+        self.update_state_bulk({
+            'inventory': self.inventory,
+            'pending_store_orders': len(self.pending_store_orders),
+            'pending_factory_orders': len(self.pending_factory_orders),
+            'processing_orders': len(self.processing_orders),
+            'available_trucks': len(self.available_trucks),
+            'assigned_trucks': len(self.assigned_trucks),
+            'orders_processed': self.orders_processed,
+            'orders_fulfilled': self.orders_fulfilled,
+            'orders_rejected': self.orders_rejected
+        })
+
+    def get_agent_info(self) -> Dict[str, Any]:
+        """
+        Get basic information about this agent, refreshing monitoring state
+        on demand. State is computed when polled rather than every step, so
+        fast-running simulations don't pay for snapshots nobody reads.
+
+        Returns:
+            Dictionary with agent information
+        """
+        self._update_state()
+        return super().get_agent_info()
+
     
     def get_inventory_level(self, product_id: str) -> int:
         """
@@ -376,8 +479,14 @@ class WarehouseAgent(BaseAgent):
             product_id: Product to add
             initial_quantity: Initial inventory level
         """
+        self._total_inventory += initial_quantity - self.inventory.get(product_id, 0)
         self.inventory[product_id] = initial_quantity
-        logger.info(f"Warehouse {self.agent_id} added product {product_id} with {initial_quantity} units")
+        self._inventory_version += 1
+        if initial_quantity <= self.reorder_threshold:
+            self._low_stock_candidates.add(product_id)
+        else:
+            self._low_stock_candidates.discard(product_id)
+        logger.info("Warehouse %s added product %s with %d units", self.agent_id, product_id, initial_quantity)
     
     def get_truck_status(self) -> Dict[str, Any]:
         """
@@ -386,21 +495,20 @@ class WarehouseAgent(BaseAgent):
         Returns:
             Dictionary with truck status information
         """
+        truck_ids = self._truck_ids
         return {
-            'available_trucks': self.available_trucks.copy(),
-            'assigned_trucks': self.assigned_trucks.copy(),
+            'available_trucks': [truck_ids[idx] for idx in self.available_trucks],
+            'assigned_trucks': {truck_ids[idx]: order_id
+                                for idx, order_id in self.assigned_trucks.items()},
             'total_trucks': self.max_trucks
         }
     
     def _record_storage_costs(self):
         """Record storage costs for current inventory in performance tracker."""
-        if hasattr(self, 'performance_tracker') and self.performance_tracker:
-            for product_id, quantity in self.inventory.items():
-                if quantity > 0:
-                    storage_cost_per_unit = 0.05  # $0.05 per unit per time step (lower than stores)
-                    self.performance_tracker.record_storage_cost(
-                        self.agent_id, product_id, quantity, storage_cost_per_unit
-                    )
+        tracker = self.performance_tracker  # None unless the web layer attached one
+        if tracker is not None:
+            storage_cost_per_unit = 0.05  # $0.05 per unit per time step (lower than stores)
+            tracker.record_storage_costs_bulk(self.agent_id, self.inventory, storage_cost_per_unit)
 
     def get_performance_metrics(self) -> Dict[str, Any]:
         """
@@ -409,17 +517,28 @@ class WarehouseAgent(BaseAgent):
         Returns:
             Dictionary with performance metrics
         """
-        total_inventory = sum(self.inventory.values())
-        
-        return {
+        # The inventory version moves on every inventory write and the
+        # counters/sizes cover the order and truck paths, so an equal key
+        # means the cached dict is still accurate
+        cache_key = (self._inventory_version,
+                     self.orders_processed, self.orders_fulfilled, self.orders_rejected,
+                     len(self.pending_store_orders), len(self.pending_factory_orders),
+                     len(self.processing_orders), len(self.assigned_trucks))
+        if cache_key == self._metrics_cache_key:
+            return self._metrics_cache
+        
+        metrics = {
             'orders_processed': self.orders_processed,
             'orders_fulfilled': self.orders_fulfilled,
             'orders_rejected': self.orders_rejected,
             'fulfillment_rate': self.orders_fulfilled / max(self.orders_processed, 1),
-            'total_inventory': total_inventory,
+            'total_inventory': self._total_inventory,
             'pending_store_orders': len(self.pending_store_orders),
             'pending_factory_orders': len(self.pending_factory_orders),
             'processing_orders': len(self.processing_orders),
             'truck_utilization': len(self.assigned_trucks) / max(self.max_trucks, 1),
             'inventory_by_product': self.inventory.copy()
-        }
\ No newline at end of file
+        }
+        self._metrics_cache_key = cache_key
+        self._metrics_cache = metrics
+        return metrics
\ No newline at end of file
@@ -1,4 +1,9 @@
 # Models package
+#
+# Constructor validation in these classes runs under `if __debug__:` only;
+# production runs launched with `python -O` skip it entirely, so malformed
+# ids/quantities surface during development rather than costing every
+# allocation at message rates.
 from .location import Location
 from .product import Product
 from .order import Order
@@ -5,7 +5,9 @@ from typing import Literal
 
 class Location:
     """Represents a location in the supply chain network."""
-    
+
+    __slots__ = ('location_id', 'name', 'x', 'y', 'location_type')
+
     def __init__(self, location_id: str, name: str, x: float, y: float, 
                  location_type: Literal['factory', 'warehouse', 'store']):
         """
@@ -18,12 +20,14 @@ class Location:
             y: Y coordinate on the city map
             location_type: Type of location (factory, warehouse, or store)
         """
-        if not location_id:
-            raise ValueError("Location ID cannot be empty")
-        if not name:
-            raise ValueError("Location name cannot be empty")
-        if location_type not in ['factory', 'warehouse', 'store']:
-            raise ValueError("Location type must be 'factory', 'warehouse', or 'store'")
+        # Validation is debug-only; run with -O to elide it (see models package)
+        if __debug__:
+            if not location_id:
+                raise ValueError("Location ID cannot be empty")
+            if not name:
+                raise ValueError("Location name cannot be empty")
+            if location_type not in ['factory', 'warehouse', 'store']:
+                raise ValueError("Location type must be 'factory', 'warehouse', or 'store'")
         
         self.location_id = location_id
         self.name = name
@@ -31,9 +35,19 @@ class Location:
         self.y = y
         self.location_type = location_type
     
+    def distance_sq_to(self, other: 'Location') -> float:
+        """
+        Calculate squared straight-line distance to another location.
+        Order-preserving, so nearest-neighbour comparisons and sort keys
+        should use this and skip the square root.
+        """
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
+
     def distance_to(self, other: 'Location') -> float:
         """Calculate straight-line distance to another location."""
-        return ((self.x - other.x) ** 2 + (self.y - other.y) ** 2) ** 0.5
+        return self.distance_sq_to(other) ** 0.5
     
     def __str__(self) -> str:
         return f"{self.name} ({self.location_type}) at ({self.x}, {self.y})"
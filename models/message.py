@@ -6,7 +6,11 @@ import time
 
 class Message:
     """Represents a message between agents in the simulation."""
-    
+
+    # Messages are created in bulk on the bus hot path; slots keep them
+    # small and make field access a fixed-offset lookup
+    __slots__ = ('sender', 'recipient', 'message_type', 'data', 'timestamp')
+
     def __init__(self, sender: str, recipient: str, message_type: str, 
                  data: Dict[str, Any], timestamp: float = None):
         """
@@ -19,14 +23,17 @@ class Message:
             data: Dictionary containing message payload
             timestamp: When the message was created (defaults to current time)
         """
-        if not sender:
-            raise ValueError("Sender cannot be empty")
-        if not recipient:
-            raise ValueError("Recipient cannot be empty")
-        if not message_type:
-            raise ValueError("Message type cannot be empty")
-        if data is None:
-            raise ValueError("Data cannot be None")
+        # Validation is debug-only: messages are created at bus rates and
+        # these never fire in a correct sim. Run with -O to elide them.
+        if __debug__:
+            if not sender:
+                raise ValueError("Sender cannot be empty")
+            if not recipient:
+                raise ValueError("Recipient cannot be empty")
+            if not message_type:
+                raise ValueError("Message type cannot be empty")
+            if data is None:
+                raise ValueError("Data cannot be None")
         
         self.sender = sender
         self.recipient = recipient
@@ -1,12 +1,18 @@
 """Order data model for the supply chain simulator."""
 
 from typing import Literal
+import sys
 import time
 
 
 class Order:
     """Represents an order in the supply chain."""
-    
+
+    # Orders are created at message rates; slots keep them small and make
+    # field access a fixed-offset lookup
+    __slots__ = ('order_id', 'product_id', 'quantity', 'requester', 'timestamp',
+                 'status', 'delivery_location')
+
     def __init__(self, order_id: str, product_id: str, quantity: int, 
                  requester: str, timestamp: float = None):
         """
@@ -19,24 +25,31 @@ class Order:
             requester: ID of the agent placing the order
             timestamp: When the order was created (defaults to current time)
         """
-        if not order_id:
-            raise ValueError("Order ID cannot be empty")
-        if not product_id:
-            raise ValueError("Product ID cannot be empty")
-        if quantity <= 0:
-            raise ValueError("Quantity must be positive")
-        if not requester:
-            raise ValueError("Requester cannot be empty")
+        # Validation is debug-only; run with -O to elide it (see models package)
+        if __debug__:
+            if not order_id:
+                raise ValueError("Order ID cannot be empty")
+            if not product_id:
+                raise ValueError("Product ID cannot be empty")
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            if not requester:
+                raise ValueError("Requester cannot be empty")
         
         self.order_id = order_id
-        self.product_id = product_id
+        # Interned ids share one canonical string, so the equality checks
+        # in pending-order scans compare by identity
+        self.product_id = sys.intern(product_id)
         self.quantity = quantity
-        self.requester = requester
+        self.requester = sys.intern(requester)
         self.timestamp = timestamp if timestamp is not None else time.time()
         self.status: Literal['pending', 'processing', 'shipped', 'delivered', 'cancelled'] = 'pending'
+        self.delivery_location = None  # Set by warehouses when routing store orders
     
     def update_status(self, new_status: Literal['pending', 'processing', 'shipped', 'delivered', 'cancelled']):
-        """Update the order status."""
+        """Update the order status. No-op if the status is unchanged."""
+        if new_status == self.status:
+            return
         valid_statuses = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
         if new_status not in valid_statuses:
             raise ValueError(f"Invalid status. Must be one of: {valid_statuses}")
@@ -3,7 +3,9 @@
 
 class Product:
     """Represents a product in the supply chain."""
-    
+
+    __slots__ = ('product_id', 'name', 'unit_cost', 'storage_cost')
+
     def __init__(self, product_id: str, name: str, unit_cost: float, storage_cost: float):
         """
         Initialize a Product.
@@ -14,14 +16,16 @@ class Product:
             unit_cost: Cost per unit of the product
             storage_cost: Cost to store one unit per time step
         """
-        if not product_id:
-            raise ValueError("Product ID cannot be empty")
-        if not name:
-            raise ValueError("Product name cannot be empty")
-        if unit_cost < 0:
-            raise ValueError("Unit cost cannot be negative")
-        if storage_cost < 0:
-            raise ValueError("Storage cost cannot be negative")
+        # Validation is debug-only; run with -O to elide it (see models package)
+        if __debug__:
+            if not product_id:
+                raise ValueError("Product ID cannot be empty")
+            if not name:
+                raise ValueError("Product name cannot be empty")
+            if unit_cost < 0:
+                raise ValueError("Unit cost cannot be negative")
+            if storage_cost < 0:
+                raise ValueError("Storage cost cannot be negative")
         
         self.product_id = product_id
         self.name = name
@@ -2,6 +2,8 @@
 Agent Integration module for wiring all agent types into the simulation manager.
 """
 import logging
+import sys
+import time
 from typing import Dict, List, Any, Optional
 from agents.base_agent import BaseAgent
 from agents.store_agent import StoreAgent
@@ -22,7 +24,14 @@ class AgentIntegration:
     Handles integration of all agent types with the simulation manager.
     Provides methods for agent registration, configuration, and coordination.
     """
-    
+
+    # Fixed attribute set: avoids a per-instance __dict__, matching the
+    # agents themselves
+    __slots__ = ('simulation_manager', 'city_map', 'message_bus', 'agents',
+                 'agent_types', 'store_agents', 'warehouse_agents', 'factory_agents',
+                 'truck_agents', 'market_agents', '_type_registry', '_stats_cache',
+                 '_stats_cache_time')
+
     def __init__(self, simulation_manager: SimulationManager, city_map: CityMap, message_bus: MessageBus):
         """
         Initialize agent integration.
@@ -36,12 +45,30 @@ class AgentIntegration:
         self.city_map = city_map
         self.message_bus = message_bus
         
-        # Agent registries
+        # Agent registries. The master dict answers id lookups in one hash
+        # probe; the per-type dicts are convenience views kept in sync on
+        # the same write paths
+        self.agents: Dict[str, BaseAgent] = {}
+        self.agent_types: Dict[str, str] = {}
         self.store_agents: Dict[str, StoreAgent] = {}
         self.warehouse_agents: Dict[str, WarehouseAgent] = {}
         self.factory_agents: Dict[str, FactoryAgent] = {}
         self.truck_agents: Dict[str, TruckAgent] = {}
         self.market_agents: Dict[str, MarketAgent] = {}
+        # Type-name to view-dict table; values are live references, so the
+        # table never needs resyncing
+        self._type_registry: Dict[str, Dict[str, BaseAgent]] = {
+            'store': self.store_agents,
+            'warehouse': self.warehouse_agents,
+            'factory': self.factory_agents,
+            'truck': self.truck_agents,
+            'market': self.market_agents
+        }
+        
+        # Short-TTL snapshot of get_integration_stats; dashboards can poll
+        # far faster than the numbers meaningfully change
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_cache_time = 0.0
         
         logger.info("AgentIntegration initialized")
     
@@ -66,12 +93,23 @@ class AgentIntegration:
             KeyError: If location doesn't exist
             ValueError: If agent_id already exists
         """
-        if agent_id in self.store_agents:
-            raise ValueError(f"Store agent '{agent_id}' already exists")
-        
         location = self.city_map.get_location(location_id)
         if not location:
             raise KeyError(f"Location '{location_id}' not found")
+        return self._create_store_agent(agent_id, location, initial_inventory,
+                                        reorder_threshold, reorder_quantity)
+    
+    def _create_store_agent(self, agent_id: str, location: Location,
+                            initial_inventory: Dict[str, int] = None,
+                            reorder_threshold: int = 10,
+                            reorder_quantity: int = 50,
+                            register: bool = True) -> StoreAgent:
+        """Create a store agent from a pre-resolved Location (no map lookup)."""
+        # Interned ids share one canonical string across the registries,
+        # the bus and the agent itself
+        agent_id = sys.intern(agent_id)
+        if agent_id in self.store_agents:
+            raise ValueError(f"Store agent '{agent_id}' already exists")
         
         # Set default inventory if not provided
         if initial_inventory is None:
@@ -88,8 +126,12 @@ class AgentIntegration:
         )
         
         # Register with simulation manager and local registry
-        self.simulation_manager.register_agent(store_agent)
+        if register:
+            self.simulation_manager.register_agent(store_agent)
         self.store_agents[agent_id] = store_agent
+        self.agents[agent_id] = store_agent
+        self.agent_types[agent_id] = 'store'
+        self.invalidate_stats_cache()
         
         logger.info(f"Created and registered store agent: {agent_id} at {location.name}")
         return store_agent
@@ -117,12 +159,24 @@ class AgentIntegration:
             KeyError: If location doesn't exist
             ValueError: If agent_id already exists
         """
-        if agent_id in self.warehouse_agents:
-            raise ValueError(f"Warehouse agent '{agent_id}' already exists")
-        
         location = self.city_map.get_location(location_id)
         if not location:
             raise KeyError(f"Location '{location_id}' not found")
+        return self._create_warehouse_agent(agent_id, location, initial_inventory,
+                                            reorder_threshold, reorder_quantity, max_trucks)
+    
+    def _create_warehouse_agent(self, agent_id: str, location: Location,
+                                initial_inventory: Dict[str, int] = None,
+                                reorder_threshold: int = 20,
+                                reorder_quantity: int = 100,
+                                max_trucks: int = 3,
+                                register: bool = True) -> WarehouseAgent:
+        """Create a warehouse agent from a pre-resolved Location (no map lookup)."""
+        # Interned ids share one canonical string across the registries,
+        # the bus and the agent itself
+        agent_id = sys.intern(agent_id)
+        if agent_id in self.warehouse_agents:
+            raise ValueError(f"Warehouse agent '{agent_id}' already exists")
         
         # Set default inventory if not provided
         if initial_inventory is None:
@@ -140,8 +194,12 @@ class AgentIntegration:
         )
         
         # Register with simulation manager and local registry
-        self.simulation_manager.register_agent(warehouse_agent)
+        if register:
+            self.simulation_manager.register_agent(warehouse_agent)
         self.warehouse_agents[agent_id] = warehouse_agent
+        self.agents[agent_id] = warehouse_agent
+        self.agent_types[agent_id] = 'warehouse'
+        self.invalidate_stats_cache()
         
         logger.info(f"Created and registered warehouse agent: {agent_id} at {location.name}")
         return warehouse_agent
@@ -167,12 +225,23 @@ class AgentIntegration:
             KeyError: If location doesn't exist
             ValueError: If agent_id already exists
         """
-        if agent_id in self.factory_agents:
-            raise ValueError(f"Factory agent '{agent_id}' already exists")
-        
         location = self.city_map.get_location(location_id)
         if not location:
             raise KeyError(f"Location '{location_id}' not found")
+        return self._create_factory_agent(agent_id, location, production_capacity,
+                                          production_time, initial_inventory)
+    
+    def _create_factory_agent(self, agent_id: str, location: Location,
+                              production_capacity: int = 2,
+                              production_time: int = 3,
+                              initial_inventory: Dict[str, int] = None,
+                              register: bool = True) -> FactoryAgent:
+        """Create a factory agent from a pre-resolved Location (no map lookup)."""
+        # Interned ids share one canonical string across the registries,
+        # the bus and the agent itself
+        agent_id = sys.intern(agent_id)
+        if agent_id in self.factory_agents:
+            raise ValueError(f"Factory agent '{agent_id}' already exists")
         
         # Set default inventory if not provided
         if initial_inventory is None:
@@ -189,8 +258,12 @@ class AgentIntegration:
         )
         
         # Register with simulation manager and local registry
-        self.simulation_manager.register_agent(factory_agent)
+        if register:
+            self.simulation_manager.register_agent(factory_agent)
         self.factory_agents[agent_id] = factory_agent
+        self.agents[agent_id] = factory_agent
+        self.agent_types[agent_id] = 'factory'
+        self.invalidate_stats_cache()
         
         logger.info(f"Created and registered factory agent: {agent_id} at {location.name}")
         return factory_agent
@@ -213,12 +286,20 @@ class AgentIntegration:
             KeyError: If location doesn't exist
             ValueError: If agent_id already exists
         """
-        if agent_id in self.truck_agents:
-            raise ValueError(f"Truck agent '{agent_id}' already exists")
-        
         location = self.city_map.get_location(location_id)
         if not location:
             raise KeyError(f"Location '{location_id}' not found")
+        return self._create_truck_agent(agent_id, location, speed, capacity)
+    
+    def _create_truck_agent(self, agent_id: str, location: Location,
+                            speed: float = 10.0, capacity: int = 100,
+                            register: bool = True) -> TruckAgent:
+        """Create a truck agent from a pre-resolved Location (no map lookup)."""
+        # Interned ids share one canonical string across the registries,
+        # the bus and the agent itself
+        agent_id = sys.intern(agent_id)
+        if agent_id in self.truck_agents:
+            raise ValueError(f"Truck agent '{agent_id}' already exists")
         
         # Create truck agent
         truck_agent = TruckAgent(
@@ -231,8 +312,12 @@ class AgentIntegration:
         )
         
         # Register with simulation manager and local registry
-        self.simulation_manager.register_agent(truck_agent)
+        if register:
+            self.simulation_manager.register_agent(truck_agent)
         self.truck_agents[agent_id] = truck_agent
+        self.agents[agent_id] = truck_agent
+        self.agent_types[agent_id] = 'truck'
+        self.invalidate_stats_cache()
         
         logger.info(f"Created and registered truck agent: {agent_id} at {location.name}")
         return truck_agent
@@ -260,16 +345,30 @@ class AgentIntegration:
             KeyError: If location doesn't exist
             ValueError: If agent_id already exists
         """
-        if agent_id in self.market_agents:
-            raise ValueError(f"Market agent '{agent_id}' already exists")
-        
         location = self.city_map.get_location(location_id)
         if not location:
             raise KeyError(f"Location '{location_id}' not found")
+        return self._create_market_agent(agent_id, location, store_ids, base_demand_rate,
+                                         demand_variation, event_probability)
+    
+    def _create_market_agent(self, agent_id: str, location: Location,
+                             store_ids: List[str] = None,
+                             base_demand_rate: float = 1.0,
+                             demand_variation: float = 0.5,
+                             event_probability: float = 0.1,
+                             register: bool = True) -> MarketAgent:
+        """Create a market agent from a pre-resolved Location (no map lookup)."""
+        # Interned ids share one canonical string across the registries,
+        # the bus and the agent itself
+        agent_id = sys.intern(agent_id)
+        if agent_id in self.market_agents:
+            raise ValueError(f"Market agent '{agent_id}' already exists")
         
-        # Use all store agents if no specific list provided
+        # Use all store agents if no specific list provided. A tuple
+        # snapshot is enough: MarketAgent copies the ids into its own list
+        # at construction
         if store_ids is None:
-            store_ids = list(self.store_agents.keys())
+            store_ids = tuple(self.store_agents)
         
         # Create market agent
         market_agent = MarketAgent(
@@ -283,13 +382,18 @@ class AgentIntegration:
         )
         
         # Register with simulation manager and local registry
-        self.simulation_manager.register_agent(market_agent)
+        if register:
+            self.simulation_manager.register_agent(market_agent)
         self.market_agents[agent_id] = market_agent
+        self.agents[agent_id] = market_agent
+        self.agent_types[agent_id] = 'market'
+        self.invalidate_stats_cache()
         
         logger.info(f"Created and registered market agent: {agent_id} managing {len(store_ids)} stores")
         return market_agent
     
-    def create_trucks_for_warehouse(self, warehouse_id: str, num_trucks: int = 3) -> List[TruckAgent]:
+    def create_trucks_for_warehouse(self, warehouse_id: str, num_trucks: int = 3,
+                                    register: bool = True) -> List[TruckAgent]:
         """
         Create multiple truck agents for a specific warehouse.
         
@@ -307,13 +411,13 @@ class AgentIntegration:
             raise ValueError(f"Warehouse '{warehouse_id}' not found")
         
         warehouse = self.warehouse_agents[warehouse_id]
-        warehouse_location_id = warehouse.location.location_id
+        warehouse_location = warehouse.location
         
         trucks = []
         for i in range(1, num_trucks + 1):
             truck_id = f"truck_{warehouse_id}_{i}"
             try:
-                truck = self.create_truck_agent(truck_id, warehouse_location_id)
+                truck = self._create_truck_agent(truck_id, warehouse_location, register=register)
                 trucks.append(truck)
             except ValueError:
                 # Truck already exists, skip
@@ -342,13 +446,17 @@ class AgentIntegration:
             'trucks': [],
             'markets': []
         }
+        # Defer simulation-manager registration and do it in one batch call
+        # at the end; register_agent's duplicate scan is linear per agent
+        new_agents = []
         
-        # Create factory agents
+        # Create factory agents from the already-resolved Location objects;
+        # no per-agent get_location round-trip
         factory_locations = self.city_map.get_locations_by_type('factory')
         for i, location in enumerate(factory_locations, 1):
             factory_id = f"factory_{i}"
             try:
-                self.create_factory_agent(factory_id, location.location_id)
+                new_agents.append(self._create_factory_agent(factory_id, location, register=False))
                 created_agents['factories'].append(factory_id)
             except ValueError:
                 logger.warning(f"Factory {factory_id} already exists")
@@ -358,11 +466,12 @@ class AgentIntegration:
         for i, location in enumerate(warehouse_locations, 1):
             warehouse_id = f"warehouse_{i}"
             try:
-                self.create_warehouse_agent(warehouse_id, location.location_id)
+                new_agents.append(self._create_warehouse_agent(warehouse_id, location, register=False))
                 created_agents['warehouses'].append(warehouse_id)
                 
                 # Create trucks for this warehouse
-                trucks = self.create_trucks_for_warehouse(warehouse_id, 3)
+                trucks = self.create_trucks_for_warehouse(warehouse_id, 3, register=False)
+                new_agents.extend(trucks)
                 created_agents['trucks'].extend([truck.agent_id for truck in trucks])
             except ValueError:
                 logger.warning(f"Warehouse {warehouse_id} already exists")
@@ -372,7 +481,7 @@ class AgentIntegration:
         for i, location in enumerate(store_locations, 1):
             store_id = f"store_{i}"
             try:
-                self.create_store_agent(store_id, location.location_id)
+                new_agents.append(self._create_store_agent(store_id, location, register=False))
                 created_agents['stores'].append(store_id)
             except ValueError:
                 logger.warning(f"Store {store_id} already exists")
@@ -380,17 +489,22 @@ class AgentIntegration:
         # Create market agent to manage all stores
         if created_agents['stores']:
             # Use the first warehouse location for the market agent
-            market_location_id = warehouse_locations[0].location_id if warehouse_locations else store_locations[0].location_id
+            market_location = warehouse_locations[0] if warehouse_locations else store_locations[0]
             try:
-                market_agent = self.create_market_agent(
+                market_agent = self._create_market_agent(
                     "market_1", 
-                    market_location_id, 
-                    created_agents['stores']
+                    market_location, 
+                    created_agents['stores'],
+                    register=False
                 )
+                new_agents.append(market_agent)
                 created_agents['markets'].append(market_agent.agent_id)
             except ValueError:
                 logger.warning("Market agent already exists")
         
+        if new_agents:
+            self.simulation_manager.register_agents(new_agents)
+        
         logger.info(f"Default supply chain setup complete: {created_agents}")
         return created_agents
     
@@ -401,13 +515,17 @@ class AgentIntegration:
         Returns:
             List of all agent instances
         """
-        all_agents = []
-        all_agents.extend(self.store_agents.values())
-        all_agents.extend(self.warehouse_agents.values())
-        all_agents.extend(self.factory_agents.values())
-        all_agents.extend(self.truck_agents.values())
-        all_agents.extend(self.market_agents.values())
-        return all_agents
+        return list(self.agents.values())
+    
+    def iter_all_agents(self):
+        """
+        Iterate all registered agents without building a list. Prefer this
+        on per-tick paths that only loop over the agents.
+        
+        Returns:
+            View over all agent instances
+        """
+        return self.agents.values()
     
     def get_agent_by_id(self, agent_id: str) -> Optional[BaseAgent]:
         """
@@ -419,12 +537,7 @@ class AgentIntegration:
         Returns:
             Agent instance or None if not found
         """
-        # Check all agent registries
-        for registry in [self.store_agents, self.warehouse_agents, self.factory_agents, 
-                        self.truck_agents, self.market_agents]:
-            if agent_id in registry:
-                return registry[agent_id]
-        return None
+        return self.agents.get(agent_id)
     
     def get_agents_by_type(self, agent_type: str) -> List[BaseAgent]:
         """
@@ -436,18 +549,8 @@ class AgentIntegration:
         Returns:
             List of agents of the specified type
         """
-        if agent_type == 'store':
-            return list(self.store_agents.values())
-        elif agent_type == 'warehouse':
-            return list(self.warehouse_agents.values())
-        elif agent_type == 'factory':
-            return list(self.factory_agents.values())
-        elif agent_type == 'truck':
-            return list(self.truck_agents.values())
-        elif agent_type == 'market':
-            return list(self.market_agents.values())
-        else:
-            return []
+        registry = self._type_registry.get(agent_type)
+        return list(registry.values()) if registry is not None else []
     
     def remove_agent(self, agent_id: str) -> bool:
         """
@@ -459,24 +562,17 @@ class AgentIntegration:
         Returns:
             True if agent was removed, False if not found
         """
-        agent = self.get_agent_by_id(agent_id)
-        if not agent:
+        agent = self.agents.pop(agent_id, None)
+        if agent is None:
             return False
         
         # Unregister from simulation manager
         self.simulation_manager.unregister_agent(agent)
         
-        # Remove from appropriate registry
-        if agent_id in self.store_agents:
-            del self.store_agents[agent_id]
-        elif agent_id in self.warehouse_agents:
-            del self.warehouse_agents[agent_id]
-        elif agent_id in self.factory_agents:
-            del self.factory_agents[agent_id]
-        elif agent_id in self.truck_agents:
-            del self.truck_agents[agent_id]
-        elif agent_id in self.market_agents:
-            del self.market_agents[agent_id]
+        # Remove from the matching type view
+        agent_type = self.agent_types.pop(agent_id)
+        del self._type_registry[agent_type][agent_id]
+        self.invalidate_stats_cache()
         
         logger.info(f"Removed agent: {agent_id}")
         return True
@@ -488,8 +584,12 @@ class AgentIntegration:
         Returns:
             Dictionary with integration statistics
         """
-        return {
-            'total_agents': len(self.get_all_agents()),
+        now = time.monotonic()
+        if self._stats_cache is not None and now - self._stats_cache_time < 0.1:
+            return self._stats_cache
+        
+        stats = {
+            'total_agents': len(self.agents),
             'store_agents': len(self.store_agents),
             'warehouse_agents': len(self.warehouse_agents),
             'factory_agents': len(self.factory_agents),
@@ -499,10 +599,17 @@ class AgentIntegration:
             'city_map_locations': len(self.city_map),
             'message_bus_stats': self.message_bus.get_stats()
         }
+        self._stats_cache = stats
+        self._stats_cache_time = now
+        return stats
+    
+    def invalidate_stats_cache(self):
+        """Drop the cached stats snapshot after agent creation or removal."""
+        self._stats_cache = None
     
     def reset_all_agents(self):
         """Reset all agents to their initial state."""
-        for agent in self.get_all_agents():
+        for agent in self.iter_all_agents():
             agent.state.clear()
             agent.active = True
             agent.last_step_time = 0
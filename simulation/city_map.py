@@ -18,7 +18,10 @@ class CityMap:
     def __init__(self):
         """Initialize an empty city map."""
         self.locations: Dict[str, Location] = {}
+        # Full pairwise distance table keyed by (id, id) in both orders;
+        # rebuilt lazily after the location set changes
         self._distance_cache: Dict[Tuple[str, str], float] = {}
+        self._cache_stale = False
         
         logger.info("CityMap initialized")
     
@@ -36,8 +39,8 @@ class CityMap:
             raise ValueError(f"Location with ID '{location.location_id}' already exists")
         
         self.locations[location.location_id] = location
-        # Clear distance cache since we added a new location
-        self._distance_cache.clear()
+        # Invalidate the distance table since we added a new location
+        self._cache_stale = True
         
         logger.info(f"Added location: {location}")
     
@@ -55,8 +58,8 @@ class CityMap:
             raise KeyError(f"Location '{location_id}' not found")
         
         removed_location = self.locations.pop(location_id)
-        # Clear distance cache since we removed a location
-        self._distance_cache.clear()
+        # Invalidate the distance table since we removed a location
+        self._cache_stale = True
         
         logger.info(f"Removed location: {removed_location}")
     
@@ -93,10 +96,25 @@ class CityMap:
         """
         return [loc for loc in self.locations.values() if loc.location_type == location_type]
     
+    def _rebuild_distance_cache(self):
+        """Precompute all pairwise distances into the lookup table."""
+        cache = {}
+        items = list(self.locations.items())
+        for i, (id1, loc1) in enumerate(items):
+            cache[(id1, id1)] = 0.0
+            for id2, loc2 in items[i + 1:]:
+                distance = loc1.distance_to(loc2)
+                cache[(id1, id2)] = distance
+                cache[(id2, id1)] = distance
+        self._distance_cache = cache
+        self._cache_stale = False
+        logger.debug("Distance table rebuilt for %d locations", len(items))
+
     def calculate_distance(self, location_id1: str, location_id2: str) -> float:
         """
         Calculate straight-line distance between two locations.
-        Uses caching for performance optimization.
+        Locations are static between map edits, so all pairwise distances
+        are precomputed and each call is a single table lookup.
         
         Args:
             location_id1: ID of first location
@@ -108,29 +126,16 @@ class CityMap:
         Raises:
             KeyError: If either location doesn't exist
         """
-        if location_id1 not in self.locations:
-            raise KeyError(f"Location '{location_id1}' not found")
-        if location_id2 not in self.locations:
-            raise KeyError(f"Location '{location_id2}' not found")
-        
-        # Same location
-        if location_id1 == location_id2:
-            return 0.0
-        
-        # Check cache (order-independent)
-        cache_key = tuple(sorted([location_id1, location_id2]))
-        if cache_key in self._distance_cache:
-            return self._distance_cache[cache_key]
-        
-        # Calculate distance
-        loc1 = self.locations[location_id1]
-        loc2 = self.locations[location_id2]
-        distance = loc1.distance_to(loc2)
-        
-        # Cache the result
-        self._distance_cache[cache_key] = distance
-        
-        return distance
+        if self._cache_stale:
+            self._rebuild_distance_cache()
+        
+        try:
+            return self._distance_cache[(location_id1, location_id2)]
+        except KeyError:
+            # Keep the specific per-location error messages
+            if location_id1 not in self.locations:
+                raise KeyError(f"Location '{location_id1}' not found") from None
+            raise KeyError(f"Location '{location_id2}' not found") from None
     
     def find_nearest_location(self, location_id: str, location_type: Optional[str] = None) -> Optional[Location]:
         """
@@ -146,21 +151,24 @@ class CityMap:
         Raises:
             KeyError: If reference location doesn't exist
         """
-        if location_id not in self.locations:
+        reference = self.locations.get(location_id)
+        if reference is None:
             raise KeyError(f"Location '{location_id}' not found")
         
-        candidates = self.locations.values()
-        if location_type:
-            candidates = [loc for loc in candidates if loc.location_type == location_type]
-        
-        # Exclude the reference location itself
-        candidates = [loc for loc in candidates if loc.location_id != location_id]
-        
-        if not candidates:
-            return None
-        
-        # Find the nearest
-        nearest = min(candidates, key=lambda loc: self.calculate_distance(location_id, loc.location_id))
+        # Single pass over squared distances: order-preserving, so no sqrt
+        # per candidate and no intermediate filtered lists
+        nearest = None
+        best_sq = float('inf')
+        distance_sq_to = reference.distance_sq_to
+        for loc in self.locations.values():
+            if loc is reference:
+                continue
+            if location_type and loc.location_type != location_type:
+                continue
+            d_sq = distance_sq_to(loc)
+            if d_sq < best_sq:
+                best_sq = d_sq
+                nearest = loc
         return nearest
     
     def find_locations_within_radius(self, location_id: str, radius: float, 
@@ -240,6 +248,7 @@ class CityMap:
         # Clear existing locations
         self.locations.clear()
         self._distance_cache.clear()
+        self._cache_stale = True
         
         # Add factories (top row)
         self.add_location(Location("factory_1", "Electronics Factory", 10, 90, "factory"))
@@ -275,8 +284,9 @@ class CityMap:
         return stats
     
     def clear_distance_cache(self):
-        """Clear the distance calculation cache."""
+        """Clear the distance table; it is rebuilt on next use."""
         self._distance_cache.clear()
+        self._cache_stale = True
         logger.debug("Distance cache cleared")
     
     def __str__(self) -> str:
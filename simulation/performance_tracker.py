@@ -120,6 +120,39 @@ class PerformanceTracker:
             self.agent_storage_costs[agent_id] = 0.0
         self.agent_storage_costs[agent_id] += cost
     
+    def record_storage_costs_bulk(self, agent_id: str, inventory: Dict[str, int],
+                                  storage_cost_per_unit: float, timestamp: float = None) -> None:
+        """
+        Record storage costs for an agent's entire inventory in one call.
+        
+        Storage costs are aggregated per agent, so recording product by
+        product only adds call overhead; this sums the quantities once and
+        applies a single update.
+        
+        Args:
+            agent_id: ID of the agent incurring storage costs
+            inventory: Inventory levels {product_id: quantity}
+            storage_cost_per_unit: Storage cost per unit per time step
+            timestamp: When the cost was incurred (defaults to current time)
+        """
+        if storage_cost_per_unit < 0:
+            raise ValueError("Storage cost cannot be negative")
+        
+        total_units = 0
+        for quantity in inventory.values():
+            if quantity > 0:
+                total_units += quantity
+        if total_units == 0:
+            return
+        
+        cost = total_units * storage_cost_per_unit
+        self.metrics.total_storage_costs += cost
+        
+        # Track per-agent storage costs
+        if agent_id not in self.agent_storage_costs:
+            self.agent_storage_costs[agent_id] = 0.0
+        self.agent_storage_costs[agent_id] += cost
+    
     def record_stockout(self, agent_id: str, product_id: str, requested_quantity: int,
                        lost_revenue: float, timestamp: float = None) -> None:
         """
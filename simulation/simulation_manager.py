@@ -52,6 +52,26 @@ class SimulationManager:
         else:
             logger.warning(f"Agent {agent.agent_id} already registered")
     
+    def register_agents(self, agents):
+        """
+        Register a batch of agents in one call. Builds the duplicate check
+        once instead of scanning the agent list per registration, so bulk
+        setup stays linear.
+        
+        Args:
+            agents: Iterable of BaseAgent instances to register
+        """
+        existing = set(map(id, self.agents))
+        added = 0
+        for agent in agents:
+            if id(agent) in existing:
+                logger.warning(f"Agent {agent.agent_id} already registered")
+                continue
+            existing.add(id(agent))
+            self.agents.append(agent)
+            added += 1
+        logger.info(f"Registered {added} agents in batch")
+    
     def unregister_agent(self, agent: BaseAgent):
         """
         Unregister an agent from the simulation.